@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+per-profile decode cost of a users/<name>.json payload, comparing the
+original requests json + strptime path against pyretrommo.api's decoder.
+
+    python3 -m benchmarks.bench_decode [-n 100000]
+"""
+from typing import (
+    Any,
+    Callable,
+)
+from datetime import (
+    datetime,
+    timedelta,
+)
+import argparse
+import json
+import timeit
+
+from pyretrommo.api import (
+    ApiPlayerInfo,
+    DATE_FORMAT,
+    decode_player,
+)
+from pyretrommo.api.parse import (
+    JSON_BACKEND,
+    loads,
+    parse_date,
+)
+
+
+PAYLOAD = json.dumps({
+    'username': 'SSMeaghan',
+    'lifetimeExperience': 1234567,
+    'permissions': 0,
+    'rank': 1,
+    'registeredAt': '2021-08-14T22:01:23.456Z',
+    'timePlayed': 987654,
+}).encode()
+
+
+def decode_before(raw: bytes) -> ApiPlayerInfo:
+    data = json.loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError()
+    return ApiPlayerInfo(
+        data['username'],
+        data['lifetimeExperience'],
+        data['permissions'],
+        data['rank'],
+        datetime.strptime(data['registeredAt'], DATE_FORMAT),
+        timedelta(seconds=data['timePlayed']),
+        auto_fetch=False,
+    )
+
+
+def decode_after(raw: bytes) -> ApiPlayerInfo:
+    return decode_player(loads(raw), 'SSMeaghan')
+
+
+def bench(name: str, fn: Callable[[], Any], n: int) -> float:
+    best = min(timeit.repeat(fn, number=n, repeat=5)) / n
+    print(f'{name:<24} {best * 1e6:8.2f} us')
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=100000)
+    args = parser.parse_args()
+
+    date = '2021-08-14T22:01:23.456Z'
+    assert parse_date(date) == datetime.strptime(date, DATE_FORMAT)
+
+    print(f'json backend: {JSON_BACKEND}')
+    bench('strptime', lambda: datetime.strptime(date, DATE_FORMAT), args.n)
+    bench('parse_date', lambda: parse_date(date), args.n)
+    before = bench('decode (before)', lambda: decode_before(PAYLOAD), args.n)
+    after = bench('decode (after)', lambda: decode_after(PAYLOAD), args.n)
+    print(f'speedup: {before / after:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
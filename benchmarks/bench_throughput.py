@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+requests/sec and p50/p99 latency of get_player against a local mock server,
+for each fetch mode:
+
+    sync    one bare requests.get per player, sequentially
+    pooled  a keep-alive ApiClient shared by a thread pool
+    async   pyretrommo.api.aio with bounded concurrency
+
+    python3 -m benchmarks.bench_throughput [-n 2000] [--latency 0.01]
+"""
+from typing import (
+    Callable,
+    List,
+)
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import time
+
+import requests
+
+from pyretrommo.api import (
+    ApiClient,
+    decode_player,
+    get_player,
+)
+from pyretrommo.api import aio
+from pyretrommo.api.mock_server import (
+    MockApiServer,
+    MockDataset,
+)
+
+
+def percentile(samples: List[float], p: float) -> float:
+    samples = sorted(samples)
+    return samples[min(int(len(samples) * p), len(samples) - 1)]
+
+
+def report(
+    mode: str,
+    elapsed: float,
+    latencies: List[float],
+    failures: List[BaseException],
+) -> None:
+    # latencies are of successful requests only
+    if not latencies:
+        print(f'{mode:<8} all {len(failures)} requests failed')
+        return
+    print(
+        f'{mode:<8} {len(latencies) / elapsed:9.1f} req/s'
+        f'  p50 {percentile(latencies, 0.50) * 1000:7.2f} ms'
+        f'  p99 {percentile(latencies, 0.99) * 1000:7.2f} ms'
+        f'  {len(failures)} failed'
+    )
+
+
+def timed(
+    latencies: List[float],
+    failures: List[BaseException],
+    fn: Callable[[], object],
+) -> None:
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        failures.append(e)
+    else:
+        latencies.append(time.perf_counter() - start)
+
+
+def bench_sync(url: str, usernames: List[str]) -> None:
+    latencies: List[float] = []
+    failures: List[BaseException] = []
+    start = time.perf_counter()
+    for username in usernames:
+        timed(latencies, failures, lambda: decode_player(
+            requests.get(f'{url}/users/{username}.json').json(),
+            username,
+        ))
+    report('sync', time.perf_counter() - start, latencies, failures)
+
+
+def bench_pooled(url: str, usernames: List[str], concurrency: int) -> None:
+    latencies: List[float] = []
+    failures: List[BaseException] = []
+    client = ApiClient(url, pool_size=concurrency, rate_limit=False)
+    with client, ThreadPoolExecutor(concurrency) as executor:
+        start = time.perf_counter()
+        list(executor.map(
+            lambda u: timed(latencies, failures, lambda: get_player(u, client)),
+            usernames,
+        ))
+        report('pooled', time.perf_counter() - start, latencies, failures)
+
+
+def bench_async(url: str, usernames: List[str], concurrency: int) -> None:
+    latencies: List[float] = []
+    failures: List[BaseException] = []
+
+    async def run() -> None:
+        sync_client = ApiClient(url, pool_size=concurrency, rate_limit=False)
+        client = aio.AsyncApiClient(sync_client, max_workers=concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(username: str) -> None:
+            async with semaphore:
+                begin = time.perf_counter()
+                try:
+                    await aio.get_player(username, client)
+                except Exception as e:
+                    failures.append(e)
+                else:
+                    latencies.append(time.perf_counter() - begin)
+
+        async with client:
+            start = time.perf_counter()
+            await asyncio.gather(*(fetch(u) for u in usernames))
+            report('async', time.perf_counter() - start, latencies, failures)
+        # the async client doesn't close a client it was given
+        sync_client.close()
+
+    asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument(
+        '--modes',
+        default='sync,pooled,async',
+        help='comma separated subset of sync,pooled,async',
+    )
+    args = parser.parse_args()
+
+    dataset = MockDataset(args.n)
+    usernames = list(dataset.users)
+    modes = args.modes.split(',')
+    with MockApiServer(
+        dataset,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    ) as server:
+        print(f'{args.n} players, {args.latency * 1000:.1f} ms latency, '
+              f'concurrency {args.concurrency}')
+        if 'sync' in modes:
+            bench_sync(server.url, usernames)
+        if 'pooled' in modes:
+            bench_pooled(server.url, usernames, args.concurrency)
+        if 'async' in modes:
+            bench_async(server.url, usernames, args.concurrency)
+
+
+if __name__ == '__main__':
+    main()
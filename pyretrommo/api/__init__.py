@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    cast,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from datetime import (
+    datetime,
+    timedelta,
+)
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import collections
+import contextlib
+import contextvars
+import itertools
+import logging
+import os
+import requests
+import threading
+import time
+
+from .cache import (
+    CacheBackend,
+    DiskBackend,
+    MemoryBackend,
+    ResponseCache,
+)
+from .frame import LeaderboardFrame
+from .metrics import (
+    MetricsSink,
+    PostRequestHook,
+    PreRequestHook,
+    Registry,
+    RequestInfo,
+)
+from .parse import (
+    DATE_FORMAT,
+    loads,
+    parse_date,
+)
+from .rank_index import RankIndex
+from .ratelimit import (
+    RateLimiter,
+    parse_retry_after,
+)
+from .singleflight import SingleFlight
+from .transport import (
+    RecordingTransport,
+    ReplayTransport,
+    SessionTransport,
+    Transport,
+)
+
+
+# override to point clients at another server, e.g. pyretrommo.api.mock_server
+BASE_URL = os.environ.get('PYRETROMMO_BASE_URL', 'https://play.retro-mmo.com')
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 10.0)
+
+# responses that are retried, after backing off
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+# ApiPlayerInfo hydration locks, striped by username
+_HYDRATE_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+# called with the username and exception of a failed bulk fetch
+ErrorHandler = Callable[[str, Exception], None]
+
+
+class ApiError(Exception):
+    ...
+
+
+class AutofetchError(ApiError):
+    """raised instead of an implicit get_player while in strict mode"""
+
+
+class ApiClient:
+    """owns a pooled, keep-alive requests.Session for the RetroMMO web api"""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        *,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = True,
+        rate_limit: Optional[bool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[MetricsSink] = None,
+        transport: Optional[Transport] = None,
+    ) -> None:
+        self.base_url = (base_url or BASE_URL).rstrip('/')
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.session = session or requests.Session()
+        self.cache = cache
+        self.inflight = SingleFlight() if coalesce else None
+        self.rate_limiter = None
+        if rate_limit is None:
+            # on, unless the transport doesn't talk to the server
+            rate_limit = transport is None or transport.rate_limited
+        if rate_limit:
+            self.rate_limiter = rate_limiter or RateLimiter()
+        self.metrics = metrics
+        self.pre_request_hooks: List[PreRequestHook] = []
+        self.post_request_hooks: List[PostRequestHook] = []
+
+        # urllib3 only retries connection errors, throttled responses are
+        # retried in fetch() so the rate limiter can see them.
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+        self.transport = transport or SessionTransport(self.session)
+        if isinstance(transport, RecordingTransport):
+            if transport.inner is None:
+                # record what this client would send on its own
+                transport.inner = SessionTransport(self.session)
+
+    def __enter__(self) -> ApiClient:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.transport.close()
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def get(self, endpoint: str) -> Any:
+        if self.cache is not None:
+            hit, json = self.cache.get(endpoint)
+            if hit:
+                return json
+
+        if self.inflight is not None:
+            return self.inflight.do(
+                endpoint,
+                lambda: self._fetch_and_cache(endpoint),
+            )
+        return self._fetch_and_cache(endpoint)
+
+    def _fetch_and_cache(self, endpoint: str) -> Any:
+        json = self.fetch(endpoint)
+        if self.cache is not None:
+            self.cache.put(endpoint, json)
+        return json
+
+    def add_hooks(
+        self,
+        pre: Optional[PreRequestHook] = None,
+        post: Optional[PostRequestHook] = None,
+    ) -> None:
+        """pre hooks get the endpoint, post hooks a RequestInfo"""
+        if pre is not None:
+            self.pre_request_hooks.append(pre)
+        if post is not None:
+            self.post_request_hooks.append(post)
+
+    def _send(
+        self,
+        endpoint: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        instrumented = (
+            self.metrics is not None or
+            self.pre_request_hooks or
+            self.post_request_hooks
+        )
+        url = f'{self.base_url}/{endpoint}'
+        if not instrumented:
+            return self.transport.get(endpoint, url, headers, self.timeout)
+
+        for pre in self.pre_request_hooks:
+            pre(endpoint)
+        status = None
+        nbytes = 0
+        start = time.perf_counter()
+        try:
+            r = self.transport.get(endpoint, url, headers, self.timeout)
+            status = r.status_code
+            nbytes = len(r.content)
+            return r
+        finally:
+            info = RequestInfo(
+                endpoint,
+                status,
+                time.perf_counter() - start,
+                nbytes,
+            )
+            if self.metrics is not None:
+                self.metrics.record_request(info)
+            for post in self.post_request_hooks:
+                post(info)
+
+    def _request(
+        self,
+        endpoint: str,
+        headers: Optional[Dict[str, str]] = None,
+        ok: Tuple[int, ...] = (200,),
+    ) -> Any:
+        limiter = self.rate_limiter
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire(endpoint)
+            r = self._send(endpoint, headers)
+            if r.status_code in ok:
+                if limiter is not None:
+                    limiter.on_success(endpoint)
+                return r
+            if r.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                raise ApiError(r.status_code)
+
+            retry_after = parse_retry_after(r.headers.get('Retry-After'))
+            if retry_after is None:
+                retry_after = self.backoff_factor * (2 ** attempt)
+            attempt += 1
+            if limiter is not None:
+                # the next acquire waits out retry_after
+                limiter.on_throttled(endpoint, retry_after)
+            else:
+                time.sleep(retry_after)
+
+    @staticmethod
+    def _decode(r: Any, endpoint: str) -> Any:
+        try:
+            return loads(r.content)
+        except ValueError:
+            raise ApiError(f'invalid json from {endpoint}')
+
+    def fetch(self, endpoint: str) -> Any:
+        """send a request for endpoint, bypassing the cache"""
+        return self._decode(self._request(endpoint), endpoint)
+
+    def fetch_if_modified(
+        self,
+        endpoint: str,
+        etag: Optional[str] = None,
+    ) -> Tuple[bool, Any, Optional[str]]:
+        """
+        conditional request, returns (modified, json, etag). json is None
+        when the server answered 304 Not Modified for this etag.
+        """
+        headers = {'If-None-Match': etag} if etag else None
+        r = self._request(endpoint, headers, ok=(200, 304))
+        if r.status_code == 304:
+            return False, None, etag
+        return True, self._decode(r, endpoint), r.headers.get('ETag')
+
+
+_client: Optional[ApiClient] = None
+_strict = False
+# set by strict_mode(), overrides _strict in this thread or asyncio task only
+_strict_override: contextvars.ContextVar[Optional[bool]] = (
+    contextvars.ContextVar('pyretrommo_strict', default=None)
+)
+_rank_index: Optional[RankIndex] = None
+
+
+def get_client() -> ApiClient:
+    """return the module-level client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = ApiClient()
+    return _client
+
+
+def set_client(client: Optional[ApiClient]) -> None:
+    """replace the module-level client, None resets to a default client"""
+    global _client
+    if _client is not None and _client is not client:
+        _client.close()
+    _client = client
+
+
+def set_strict(strict: bool) -> None:
+    """
+    in strict mode reading an unpopulated ApiPlayerInfo field raises
+    AutofetchError instead of sending a get_player request. This sets the
+    process-wide default, see strict_mode() for a scoped one.
+    """
+    global _strict
+    _strict = strict
+
+
+def is_strict() -> bool:
+    override = _strict_override.get()
+    return _strict if override is None else override
+
+
+@contextlib.contextmanager
+def strict_mode(strict: bool = True) -> Iterator[None]:
+    """
+    strict (or not) inside the block, for the current thread or asyncio task
+    only. Blocks nest, each restores what was set when it was entered.
+    """
+    token = _strict_override.set(strict)
+    try:
+        yield
+    finally:
+        _strict_override.reset(token)
+
+
+def set_rank_index(index: Optional[RankIndex]) -> None:
+    """
+    answer ApiPlayerInfo.rank from a RankIndex instead of autofetching,
+    for as long as the index is not stale
+    """
+    global _rank_index
+    _rank_index = index
+
+
+class ApiPlayerInfo:
+
+    __slots__ = (
+        'username',
+        'experience',
+        'permissions',
+        '_rank',
+        '_registered_at',
+        '_time_played',
+        'auto_fetch',
+        'client',
+    )
+
+    def __init__(
+        self,
+        username: str,
+        experience: int,
+        permissions: int,
+        rank: Optional[int] = None,
+        registered_at: Optional[datetime] = None,
+        time_played: Optional[timedelta] = None,
+        *,
+        auto_fetch = True,
+        client: Optional[ApiClient] = None,
+    ) -> None:
+        self.username = username
+        self.experience = experience
+        self.permissions = permissions
+        self._rank = rank
+        self._registered_at = registered_at
+        self._time_played = time_played
+        self.auto_fetch = auto_fetch
+        self.client = client
+
+    def __str__(self) -> str:
+        if self._rank is not None:
+            return f'<ApiPlayerInfo: {self.username} rank {self.rank}>'
+        return f'<ApiPlayerInfo: {self.username}>'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the client holds sessions and locks, an unpickled player
+        # autofetches through the default client instead
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['client'] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def is_hydrated(self) -> bool:
+        return (
+            self._rank is not None and
+            self._registered_at is not None and
+            self._time_played is not None
+        )
+
+    @property
+    def rank(self) -> int:
+        if self._rank is None:
+            index = _rank_index
+            if index is not None and not index.stale:
+                return index.rank_of(self.experience)
+            self.try_autofetch()
+            assert self._rank is not None
+        return self._rank
+
+    @property
+    def registered_at(self) -> datetime:
+        if self._registered_at is None:
+            self.try_autofetch()
+            assert self._registered_at is not None
+        return self._registered_at
+
+    @property
+    def time_played(self) -> timedelta:
+        if self._time_played is None:
+            self.try_autofetch()
+            assert self._time_played is not None
+        return self._time_played
+
+    def try_autofetch(self) -> None:
+        if not self.auto_fetch:
+            raise ApiError('ApiPlayerInfo field is not populated')
+        if is_strict():
+            raise AutofetchError(
+                f'{self.username} is not hydrated (strict mode)'
+            )
+        lock = _HYDRATE_LOCKS[hash(self.username) % len(_HYDRATE_LOCKS)]
+        with lock:
+            # another thread may have hydrated us while we waited
+            if not self.is_hydrated:
+                metrics = (self.client or get_client()).metrics
+                if metrics is not None:
+                    metrics.record_autofetch(self.username)
+                self.update_from(get_player(self.username, self.client))
+
+    def update_from(self, info: ApiPlayerInfo) -> None:
+        self._rank = info._rank
+        self._registered_at = info._registered_at
+        self._time_played = info._time_played
+
+
+def api_get(endpoint: str, client: Optional[ApiClient] = None) -> Any:
+    return (client or get_client()).get(endpoint)
+
+
+def get_players(client: Optional[ApiClient] = None) -> List[str]:
+    return decode_players(api_get('players.json', client))
+
+
+def get_registered_users(client: Optional[ApiClient] = None) -> int:
+    return decode_registered_users(api_get('registered-users.json', client))
+
+
+def get_leaderboard(
+    page=1,
+    client: Optional[ApiClient] = None,
+    *,
+    hydrate: bool = False,
+) -> List[ApiPlayerInfo]:
+    json = api_get(f'leaderboards.json?page={page}', client)
+    players = decode_leaderboard(json, client)
+    if hydrate:
+        hydrate_players(players, client=client)
+    return players
+
+
+def get_leaderboard_frame(
+    page=1,
+    client: Optional[ApiClient] = None,
+    *,
+    frame: Optional[LeaderboardFrame] = None,
+) -> LeaderboardFrame:
+    """append a leaderboard page to frame (or a new one) and return it"""
+    json = api_get(f'leaderboards.json?page={page}', client)
+    if not isinstance(json, list):
+        raise ApiError('unexpected response from leaderboards.json')
+    frame = frame if frame is not None else LeaderboardFrame()
+    try:
+        frame.extend_json(json)
+    except (KeyError, TypeError):
+        raise ApiError('unexpected response from leaderboards.json')
+    return frame
+
+
+def iter_leaderboard(
+    start_page: int = 1,
+    prefetch: int = 4,
+    client: Optional[ApiClient] = None,
+) -> Iterator[ApiPlayerInfo]:
+    """
+    yield leaderboard rows from start_page onwards, stopping at the first
+    empty page. The next `prefetch` pages are fetched in the background
+    while the current one is consumed.
+    """
+    pages = itertools.count(start_page)
+    with ThreadPoolExecutor(max(prefetch, 1)) as executor:
+        queue = collections.deque(
+            executor.submit(get_leaderboard, next(pages), client)
+            for _ in range(prefetch + 1)
+        )
+        try:
+            while queue:
+                players = queue.popleft().result()
+                if not players:
+                    return
+                queue.append(
+                    executor.submit(get_leaderboard, next(pages), client)
+                )
+                yield from players
+        finally:
+            for future in queue:
+                future.cancel()
+
+
+def get_player(
+    username: str,
+    client: Optional[ApiClient] = None,
+) -> ApiPlayerInfo:
+    json = api_get(f'users/{username}.json', client)
+    return decode_player(json, username)
+
+
+def _log_error(username: str, e: Exception) -> None:
+    logging.warning(f'failed to fetch player {username}: {e!r}')
+
+
+def hydrate_players(
+    players: Iterable[ApiPlayerInfo],
+    concurrency: int = 8,
+    client: Optional[ApiClient] = None,
+    *,
+    on_error: ErrorHandler = _log_error,
+) -> None:
+    """
+    populate rank, registered_at and time_played of every player that is
+    missing them, with up to `concurrency` get_player requests in flight.
+    A failed user is passed to on_error and left unhydrated, the others
+    still get filled in.
+    """
+    by_username: Dict[str, List[ApiPlayerInfo]] = {}
+    for player in players:
+        if not player.is_hydrated:
+            by_username.setdefault(player.username, []).append(player)
+    if not by_username:
+        return
+
+    def fetch(username: str) -> ApiPlayerInfo:
+        return get_player(username, client)
+
+    with ThreadPoolExecutor(min(concurrency, len(by_username))) as executor:
+        futures = {
+            username: executor.submit(fetch, username)
+            for username in by_username
+        }
+        for username, future in futures.items():
+            try:
+                info = future.result()
+            except Exception as e:
+                on_error(username, e)
+                continue
+            for player in by_username[username]:
+                player.update_from(info)
+
+
+#
+# decoding, shared by the sync and async (pyretrommo.api.aio) clients
+#
+
+
+def decode_players(json: Any) -> List[str]:
+    if not isinstance(json, list):
+        raise ApiError('unexpected response from player.json')
+    # copy, the payload may be shared with the response cache
+    return cast(List[str], list(json))
+
+
+def decode_registered_users(json: Any) -> int:
+    if not isinstance(json, int):
+        raise ApiError('unexpected response from registered-users.json')
+    return json
+
+
+def decode_leaderboard(
+    json: Any,
+    client: Optional[ApiClient] = None,
+) -> List[ApiPlayerInfo]:
+    if not isinstance(json, list):
+        raise ApiError('unexpected response from leaderboards.json')
+
+    # rows are validated by the lookups themselves, a malformed row fails the
+    # whole payload once instead of being checked field by field.
+    try:
+        return [
+            ApiPlayerInfo(
+                player['username'],
+                player['experience'],
+                player['permissions'],
+                client=client,
+            )
+            for player in json
+        ]
+    except (KeyError, TypeError):
+        raise ApiError('unexpected response from leaderboards.json')
+
+
+def decode_player(json: Any, username: str) -> ApiPlayerInfo:
+    try:
+        return ApiPlayerInfo(
+            json['username'],
+            json['lifetimeExperience'],
+            json['permissions'],
+            json['rank'],
+            parse_date(json['registeredAt']),
+            timedelta(seconds=json['timePlayed']),
+            auto_fetch=False,
+        )
+    except (KeyError, TypeError, ValueError):
+        raise ApiError(f'unexpected response from {username}.json')
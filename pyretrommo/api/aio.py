@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+)
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import collections
+import itertools
+
+from . import (
+    ApiClient,
+    ApiPlayerInfo,
+    ErrorHandler,
+    _log_error,
+    decode_leaderboard,
+    decode_player,
+    decode_players,
+    decode_registered_users,
+)
+from .frame import LeaderboardFrame
+
+
+# asyncio counterpart of pyretrommo.api. Requests are sent by a pooled
+# ApiClient on a bounded thread pool, so connections (and everything else
+# configured on the client) are shared with the sync api. The pool's
+# max_workers caps how many requests are in flight, whatever concurrency a
+# call asks for, and is itself capped at a borrowed client's pool_size so
+# every thread has a pooled connection.
+
+
+DEFAULT_CONCURRENCY = 16
+
+
+class AsyncApiClient:
+
+    def __init__(
+        self,
+        client: Optional[ApiClient] = None,
+        *,
+        max_workers: int = DEFAULT_CONCURRENCY,
+    ) -> None:
+        # only close the ApiClient if we made it
+        self._owns_client = client is None
+        if client is None:
+            client = ApiClient(pool_size=max_workers)
+        else:
+            # more threads than connections would make urllib3 discard
+            # and reopen connections under load
+            max_workers = min(max_workers, client.pool_size)
+        self.client = client
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers,
+            thread_name_prefix='pyretrommo-aio',
+        )
+
+    async def __aenter__(self) -> AsyncApiClient:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        if self._owns_client:
+            self.client.close()
+
+    async def get(self, endpoint: str) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            self.client.get,
+            endpoint,
+        )
+
+
+_client: Optional[AsyncApiClient] = None
+
+
+def get_client() -> AsyncApiClient:
+    """return the module-level async client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = AsyncApiClient()
+    return _client
+
+
+def set_client(client: Optional[AsyncApiClient]) -> None:
+    """replace the module-level async client, None resets to a default"""
+    global _client
+    if _client is not None and _client is not client:
+        _client.close()
+    _client = client
+
+
+async def api_get(
+    endpoint: str,
+    client: Optional[AsyncApiClient] = None,
+) -> Any:
+    return await (client or get_client()).get(endpoint)
+
+
+async def get_players(client: Optional[AsyncApiClient] = None) -> List[str]:
+    return decode_players(await api_get('players.json', client))
+
+
+async def get_registered_users(
+    client: Optional[AsyncApiClient] = None,
+) -> int:
+    json = await api_get('registered-users.json', client)
+    return decode_registered_users(json)
+
+
+async def get_leaderboard(
+    page=1,
+    client: Optional[AsyncApiClient] = None,
+    *,
+    hydrate: bool = False,
+) -> List[ApiPlayerInfo]:
+    client = client or get_client()
+    json = await api_get(f'leaderboards.json?page={page}', client)
+    players = decode_leaderboard(json, client.client)
+    if hydrate:
+        await hydrate_players(players, client=client)
+    return players
+
+
+async def iter_leaderboard(
+    start_page: int = 1,
+    prefetch: int = 4,
+    client: Optional[AsyncApiClient] = None,
+) -> AsyncIterator[ApiPlayerInfo]:
+    """async version of pyretrommo.api.iter_leaderboard"""
+    pages = itertools.count(start_page)
+    queue = collections.deque(
+        asyncio.ensure_future(get_leaderboard(next(pages), client))
+        for _ in range(prefetch + 1)
+    )
+    try:
+        while queue:
+            players = await queue.popleft()
+            if not players:
+                return
+            queue.append(
+                asyncio.ensure_future(get_leaderboard(next(pages), client))
+            )
+            for player in players:
+                yield player
+    finally:
+        for task in queue:
+            task.cancel()
+
+
+async def get_player(
+    username: str,
+    client: Optional[AsyncApiClient] = None,
+) -> ApiPlayerInfo:
+    json = await api_get(f'users/{username}.json', client)
+    return decode_player(json, username)
+
+
+async def hydrate_players(
+    players: Iterable[ApiPlayerInfo],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    client: Optional[AsyncApiClient] = None,
+    *,
+    on_error: ErrorHandler = _log_error,
+) -> None:
+    """
+    async version of pyretrommo.api.hydrate_players, concurrency is capped
+    at the client's max_workers
+    """
+    client = client or get_client()
+    by_username: Dict[str, List[ApiPlayerInfo]] = {}
+    for player in players:
+        if not player.is_hydrated:
+            by_username.setdefault(player.username, []).append(player)
+
+    semaphore = asyncio.Semaphore(min(concurrency, client.max_workers))
+
+    async def hydrate(username: str) -> None:
+        try:
+            async with semaphore:
+                info = await get_player(username, client)
+        except Exception as e:
+            on_error(username, e)
+            return
+        for player in by_username[username]:
+            player.update_from(info)
+
+    await asyncio.gather(*(hydrate(u) for u in by_username))
+
+
+async def get_players_bulk(
+    usernames: Iterable[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    client: Optional[AsyncApiClient] = None,
+    *,
+    on_error: ErrorHandler = _log_error,
+) -> AsyncIterator[ApiPlayerInfo]:
+    """
+    fetch many players with at most `concurrency` requests in flight (and
+    no more than the client's max_workers), yielding each ApiPlayerInfo as
+    soon as it arrives (in completion order). A failed user is passed to
+    on_error and does not stop the others.
+    """
+    client = client or get_client()
+    # more tasks than threads would only wait in the executor's queue
+    concurrency = min(concurrency, client.max_workers)
+
+    async def fetch(username: str) -> ApiPlayerInfo:
+        return await get_player(username, client)
+
+    names = iter(usernames)
+    pending: Set[asyncio.Future[ApiPlayerInfo]] = set()
+    requested: Dict[asyncio.Future[ApiPlayerInfo], str] = {}
+    try:
+        while True:
+            while len(pending) < concurrency:
+                username = next(names, None)
+                if username is None:
+                    break
+                future = asyncio.ensure_future(fetch(username))
+                requested[future] = username
+                pending.add(future)
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(
+                pending,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                username = requested.pop(task)
+                error = task.exception()
+                if error is None:
+                    yield task.result()
+                elif isinstance(error, Exception):
+                    on_error(username, error)
+                else:
+                    raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def get_players_bulk_frame(
+    usernames: Iterable[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    client: Optional[AsyncApiClient] = None,
+    *,
+    frame: Optional[LeaderboardFrame] = None,
+    on_error: ErrorHandler = _log_error,
+) -> LeaderboardFrame:
+    """get_players_bulk, collected into a LeaderboardFrame"""
+    frame = frame if frame is not None else LeaderboardFrame()
+    async for player in get_players_bulk(
+        usernames,
+        concurrency,
+        client,
+        on_error=on_error,
+    ):
+        frame.append(player)
+    return frame
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Tuple,
+    Union,
+)
+from collections import OrderedDict
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+
+
+# Response cache used by ApiClient. Values are the decoded json payloads,
+# keyed by endpoint (e.g. 'users/d.json'), each with its own expiry.
+
+
+# seconds, keyed by endpoint_name()
+DEFAULT_TTLS: Dict[str, float] = {
+    'players': 10.0,
+    'registered-users': 60.0,
+    'leaderboards': 60.0,
+    'users': 60.0,
+}
+
+Entry = Tuple[float, Any]  # (expires at, value)
+
+
+def endpoint_name(endpoint: str) -> str:
+    """'users/d.json' -> 'users', 'leaderboards.json?page=2' -> 'leaderboards'"""
+    name = endpoint.split('?', 1)[0].split('/', 1)[0]
+    if name.endswith('.json'):
+        name = name[:-len('.json')]
+    return name
+
+
+class CacheBackend:
+
+    def get(self, key: str) -> Optional[Entry]:
+        raise NotImplementedError()
+
+    def set(self, key: str, expires: float, value: Any) -> None:
+        raise NotImplementedError()
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError()
+
+    def clear(self) -> None:
+        raise NotImplementedError()
+
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(CacheBackend):
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, expires: float, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskBackend(CacheBackend):
+    """
+    sqlite-backed cache that survives restarts. Hits only read, their access
+    times are written in batches (every flush_every hits, and before each
+    eviction pass) so lookups don't each pay for a commit.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path],
+        maxsize: int = 65536,
+        flush_every: int = 256,
+    ) -> None:
+        self.maxsize = maxsize
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        # key -> access time not yet written
+        self._accessed: Dict[str, float] = {}
+        self._closed = False
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' expires REAL NOT NULL,'
+            ' accessed REAL NOT NULL,'
+            ' value TEXT NOT NULL'
+            ')'
+        )
+        self._db.execute(
+            'CREATE INDEX IF NOT EXISTS responses_accessed '
+            'ON responses (accessed)'
+        )
+        self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_accessed()
+            self._db.commit()
+            self._db.close()
+            self._closed = True
+
+    def _flush_accessed(self) -> None:
+        # caller holds the lock and commits
+        if self._accessed:
+            self._db.executemany(
+                'UPDATE responses SET accessed = ? WHERE key = ?',
+                [(when, key) for key, when in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            row = self._db.execute(
+                'SELECT expires, value FROM responses WHERE key = ?',
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= self.flush_every:
+                self._flush_accessed()
+                self._db.commit()
+        return row[0], json.loads(row[1])
+
+    def set(self, key: str, expires: float, value: Any) -> None:
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._flush_accessed()
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)',
+                (key, expires, time.time(), json.dumps(value)),
+            )
+            self._db.execute(
+                'DELETE FROM responses WHERE key IN ('
+                ' SELECT key FROM responses ORDER BY accessed DESC'
+                ' LIMIT -1 OFFSET ?'
+                ')',
+                (self.maxsize,),
+            )
+            self._db.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._accessed.clear()
+            self._db.execute('DELETE FROM responses')
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._db.execute('SELECT COUNT(*) FROM responses').fetchone()
+        return row[0]
+
+
+class ResponseCache:
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttls: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls is not None:
+            self.ttls.update(ttls)
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, counter: Dict[str, int], name: str) -> None:
+        with self._lock:
+            counter[name] = counter.get(name, 0) + 1
+
+    def get(self, endpoint: str) -> Tuple[bool, Any]:
+        """return (hit, value) for an endpoint"""
+        name = endpoint_name(endpoint)
+        entry = self.backend.get(endpoint)
+        if entry is not None:
+            expires, value = entry
+            if expires > time.time():
+                self._count(self.hits, name)
+                return True, value
+            self.backend.delete(endpoint)
+        self._count(self.misses, name)
+        return False, None
+
+    def put(self, endpoint: str, value: Any) -> None:
+        ttl = self.ttls.get(endpoint_name(endpoint), 0)
+        if ttl > 0:
+            self.backend.set(endpoint, time.time() + ttl, value)
+
+    def invalidate(self, endpoint: str) -> None:
+        self.backend.delete(endpoint)
+
+    def close(self) -> None:
+        """close the backend, writing out anything it has pending"""
+        self.backend.close()
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                name: {
+                    'hits': self.hits.get(name, 0),
+                    'misses': self.misses.get(name, 0),
+                }
+                for name in set(self.hits) | set(self.misses)
+            }
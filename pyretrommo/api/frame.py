@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+)
+from array import array
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+import math
+import sys
+
+try:
+    import numpy
+    HAVE_NUMPY = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMPY = False
+
+if TYPE_CHECKING:
+    from . import ApiPlayerInfo
+
+
+# missing values in the integer columns
+MISSING = -1
+
+COLUMNS = (
+    'experience',
+    'permissions',
+    'rank',
+    'registered_at',
+    'time_played',
+)
+
+
+class LeaderboardFrame:
+    """
+    columnar storage for many players: interned usernames plus one typed
+    array per field. rank and time_played (seconds) are MISSING and
+    registered_at (unix epoch) is nan when a row was not hydrated.
+    """
+
+    def __init__(self) -> None:
+        self.usernames: List[str] = []
+        self.experience = array('q')
+        self.permissions = array('q')
+        self.rank = array('q')
+        self.registered_at = array('d')
+        self.time_played = array('q')
+
+    def __len__(self) -> int:
+        return len(self.usernames)
+
+    def __iter__(self) -> Iterator[ApiPlayerInfo]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> ApiPlayerInfo:
+        from . import ApiPlayerInfo
+        rank = self.rank[i]
+        registered_at = self.registered_at[i]
+        time_played = self.time_played[i]
+        return ApiPlayerInfo(
+            self.usernames[i],
+            self.experience[i],
+            self.permissions[i],
+            None if rank == MISSING else rank,
+            None if math.isnan(registered_at) else
+                datetime.fromtimestamp(registered_at, timezone.utc),
+            None if time_played == MISSING else
+                timedelta(seconds=time_played),
+        )
+
+    def append_row(
+        self,
+        username: str,
+        experience: int,
+        permissions: int,
+        rank: int = MISSING,
+        registered_at: float = math.nan,
+        time_played: int = MISSING,
+    ) -> None:
+        self.usernames.append(sys.intern(username))
+        self.experience.append(experience)
+        self.permissions.append(permissions)
+        self.rank.append(rank)
+        self.registered_at.append(registered_at)
+        self.time_played.append(time_played)
+
+    def append(self, player: ApiPlayerInfo) -> None:
+        # read the private fields, a frame must never trigger an autofetch
+        registered_at = player._registered_at
+        time_played = player._time_played
+        self.append_row(
+            player.username,
+            player.experience,
+            player.permissions,
+            MISSING if player._rank is None else player._rank,
+            math.nan if registered_at is None else registered_at.timestamp(),
+            MISSING if time_played is None else
+                int(time_played.total_seconds()),
+        )
+
+    def extend(self, players: Iterable[ApiPlayerInfo]) -> None:
+        for player in players:
+            self.append(player)
+
+    def extend_json(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """append rows of a leaderboards.json payload without ApiPlayerInfo"""
+        # convert every column before touching the frame, so a malformed row
+        # leaves it unchanged instead of with uneven columns
+        intern = sys.intern
+        usernames = [intern(row['username']) for row in rows]
+        experience = array('q', [row['experience'] for row in rows])
+        permissions = array('q', [row['permissions'] for row in rows])
+        self.usernames.extend(usernames)
+        self.experience.extend(experience)
+        self.permissions.extend(permissions)
+        self.rank.extend([MISSING] * len(rows))
+        self.registered_at.extend([math.nan] * len(rows))
+        self.time_played.extend([MISSING] * len(rows))
+
+    def take(self, indices: Iterable[int]) -> LeaderboardFrame:
+        """new frame holding the given rows, in order"""
+        indices = list(indices)
+        frame = LeaderboardFrame()
+        frame.usernames = [self.usernames[i] for i in indices]
+        for column in COLUMNS:
+            source = getattr(self, column)
+            setattr(frame, column, array(
+                source.typecode,
+                (source[i] for i in indices),
+            ))
+        return frame
+
+    def argsort(self, column: str, reverse: bool = False) -> Sequence[int]:
+        """row order by column, ties keep their original order"""
+        values = getattr(self, column)
+        if HAVE_NUMPY:
+            keys = self.column(column)
+            order = numpy.argsort(-keys if reverse else keys, kind='stable')
+            return order.tolist()
+        return sorted(
+            range(len(values)),
+            key=values.__getitem__,
+            reverse=reverse,
+        )
+
+    def sort(self, column: str, reverse: bool = False) -> LeaderboardFrame:
+        return self.take(self.argsort(column, reverse))
+
+    def column(self, column: str) -> Any:
+        """
+        zero-copy numpy view of a column (requires numpy). The frame can't
+        grow while a view is alive, arrays exporting buffers can't resize.
+        """
+        if not HAVE_NUMPY:
+            raise ImportError('LeaderboardFrame.column requires numpy')
+        values = getattr(self, column)
+        dtype = numpy.float64 if values.typecode == 'd' else numpy.int64
+        return numpy.frombuffer(values, dtype=dtype)
+
+    def where(self, mask: Any) -> LeaderboardFrame:
+        """rows where a boolean numpy mask over the frame is true"""
+        if not HAVE_NUMPY:
+            raise ImportError('LeaderboardFrame.where requires numpy')
+        return self.take(numpy.flatnonzero(mask).tolist())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+import bisect
+import threading
+
+from .cache import endpoint_name
+
+
+# Instrumentation for ApiClient. Every http request is reported to the
+# client's hooks and metrics sink as a RequestInfo.
+
+
+# latency histogram upper bounds, in seconds
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class RequestInfo(NamedTuple):
+    endpoint: str
+    status: Optional[int]  # None if the request raised
+    seconds: float
+    nbytes: int
+
+    @property
+    def name(self) -> str:
+        return endpoint_name(self.endpoint)
+
+
+PreRequestHook = Callable[[str], None]
+PostRequestHook = Callable[[RequestInfo], None]
+
+
+class Histogram:
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # last is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """upper bound of the bucket holding the q-th observation"""
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+
+class MetricsSink:
+    """receives client measurements, subclass to export elsewhere"""
+
+    def record_request(self, info: RequestInfo) -> None:
+        pass
+
+    def record_autofetch(self, username: str) -> None:
+        pass
+
+
+class Registry(MetricsSink):
+    """in-process, thread-safe metrics, per endpoint kind"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.requests: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.bytes: Dict[str, int] = {}
+        self.latency: Dict[str, Histogram] = {}
+        self.autofetches = 0
+        self._lock = threading.Lock()
+
+    def record_request(self, info: RequestInfo) -> None:
+        name = info.name
+        with self._lock:
+            self.requests[name] = self.requests.get(name, 0) + 1
+            if info.status is None or info.status >= 400:
+                self.errors[name] = self.errors.get(name, 0) + 1
+            self.bytes[name] = self.bytes.get(name, 0) + info.nbytes
+            histogram = self.latency.get(name)
+            if histogram is None:
+                histogram = self.latency[name] = Histogram(self.buckets)
+            histogram.observe(info.seconds)
+
+    def record_autofetch(self, username: str) -> None:
+        with self._lock:
+            self.autofetches += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'autofetches': self.autofetches,
+                'endpoints': {
+                    name: {
+                        'requests': self.requests[name],
+                        'errors': self.errors.get(name, 0),
+                        'bytes': self.bytes.get(name, 0),
+                        'seconds': self.latency[name].sum,
+                        'p50': self.latency[name].quantile(0.50),
+                        'p99': self.latency[name].quantile(0.99),
+                    }
+                    for name in self.requests
+                },
+            }
+
+    def render(self) -> str:
+        """prometheus text exposition format, for scraping"""
+        lines: List[str] = []
+        with self._lock:
+            lines.append(f'pyretrommo_autofetches_total {self.autofetches}')
+            for name in sorted(self.requests):
+                label = f'endpoint="{name}"'
+                lines.append(
+                    f'pyretrommo_requests_total{{{label}}} '
+                    f'{self.requests[name]}'
+                )
+                lines.append(
+                    f'pyretrommo_request_errors_total{{{label}}} '
+                    f'{self.errors.get(name, 0)}'
+                )
+                lines.append(
+                    f'pyretrommo_response_bytes_total{{{label}}} '
+                    f'{self.bytes.get(name, 0)}'
+                )
+                histogram = self.latency[name]
+                cumulative = 0
+                bounds = [str(b) for b in histogram.bounds] + ['+Inf']
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'pyretrommo_request_seconds_bucket'
+                        f'{{{label},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'pyretrommo_request_seconds_sum{{{label}}} '
+                    f'{histogram.sum}'
+                )
+                lines.append(
+                    f'pyretrommo_request_seconds_count{{{label}}} '
+                    f'{histogram.count}'
+                )
+        return '\n'.join(lines) + '\n'
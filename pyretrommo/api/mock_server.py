@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+from urllib.parse import (
+    parse_qs,
+    unquote,
+    urlsplit,
+)
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+
+
+# A local stand-in for play.retro-mmo.com, for load testing and benchmarking
+# pyretrommo.api offline:
+#
+#   python3 -m pyretrommo.api.mock_server --players 10000 --latency 0.02
+#   PYRETROMMO_BASE_URL=http://127.0.0.1:8080 python3 my_crawler.py
+
+
+LEADERBOARD_PAGE_SIZE = 100
+
+
+class MockDataset:
+
+    def __init__(
+        self,
+        size: int = 1000,
+        online: float = 0.05,
+        seed: int = 0,
+    ) -> None:
+        rng = random.Random(seed)
+        epoch = datetime(2021, 8, 1, tzinfo=timezone.utc)
+        users: List[Dict[str, Any]] = []
+        for i in range(size):
+            registered_at = epoch + timedelta(seconds=rng.randrange(30000000))
+            users.append({
+                'username': f'player{i}',
+                'lifetimeExperience': int(rng.paretovariate(1.2) * 1000),
+                'permissions': 0 if rng.random() > 0.01 else 1,
+                'registeredAt': registered_at.strftime(
+                    '%Y-%m-%dT%H:%M:%S.%f'
+                )[:-3] + 'Z',
+                'timePlayed': rng.randrange(3600 * 1000),
+            })
+        users.sort(key=lambda u: u['lifetimeExperience'], reverse=True)
+        for rank, user in enumerate(users, 1):
+            user['rank'] = rank
+
+        self.users: Dict[str, Dict[str, Any]] = {
+            u['username']: u for u in users
+        }
+        self.leaderboard = [
+            {
+                'username': u['username'],
+                'experience': u['lifetimeExperience'],
+                'permissions': u['permissions'],
+            }
+            for u in users
+        ]
+        self.online = [
+            u['username'] for u in users
+            if rng.random() < online
+        ]
+
+    def leaderboard_page(self, page: int) -> List[Dict[str, Any]]:
+        start = (page - 1) * LEADERBOARD_PAGE_SIZE
+        if start < 0:
+            return []
+        return self.leaderboard[start:start + LEADERBOARD_PAGE_SIZE]
+
+    def route(self, path: str) -> Tuple[int, Any]:
+        url = urlsplit(path)
+        endpoint = url.path.lstrip('/')
+        if endpoint == 'players.json':
+            return 200, self.online
+        if endpoint == 'registered-users.json':
+            return 200, len(self.users)
+        if endpoint == 'leaderboards.json':
+            try:
+                page = int(parse_qs(url.query).get('page', ['1'])[0])
+            except ValueError:
+                return 400, None
+            return 200, self.leaderboard_page(page)
+        if endpoint.startswith('users/') and endpoint.endswith('.json'):
+            username = unquote(endpoint[len('users/'):-len('.json')])
+            user = self.users.get(username)
+            if user is None:
+                return 404, None
+            return 200, user
+        return 404, None
+
+
+class MockApiServer:
+
+    def __init__(
+        self,
+        dataset: Optional[MockDataset] = None,
+        *,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+    ) -> None:
+        self.dataset = dataset if dataset is not None else MockDataset()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def __enter__(self) -> MockApiServer:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name='pyretrommo-mock-server',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            protocol_version = 'HTTP/1.1'
+            # keep-alive responses otherwise wait on a delayed ack
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                with server._lock:
+                    server.requests += 1
+                delay = server.latency + random.uniform(0, server.jitter)
+                if delay > 0:
+                    time.sleep(delay)
+
+                if random.random() < server.error_rate:
+                    status, body = 503, None
+                else:
+                    status, body = server.dataset.route(self.path)
+                payload = json.dumps(body).encode() if status == 200 else b''
+                etag = None
+                if status == 200:
+                    etag = f'"{hashlib.md5(payload).hexdigest()}"'
+                    if self.headers.get('If-None-Match') == etag:
+                        status, payload = 304, b''
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                if etag is not None:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--players', type=int, default=10000)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockApiServer(
+        MockDataset(args.players, seed=args.seed),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    )
+    print(f'serving mock RetroMMO api on {server.url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Union,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+import json
+
+
+# Low-level helpers for decoding api responses. orjson is used for json when
+# it is installed (pip install pyretrommo[fast]).
+
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+
+loads: Callable[[Union[bytes, str]], Any]
+try:
+    import orjson
+    loads = orjson.loads
+    JSON_BACKEND = 'orjson'
+except ImportError:  # pragma: no cover - optional dependency
+    loads = json.loads
+    JSON_BACKEND = 'json'
+
+
+_timezones: Dict[str, timezone] = {
+    'Z': timezone.utc,
+    '+00:00': timezone.utc,
+    '+0000': timezone.utc,
+}
+
+
+def _parse_timezone(value: str) -> timezone:
+    tz = _timezones.get(value)
+    if tz is None:
+        digits = value[1:].replace(':', '')
+        if len(digits) != 4 or not digits.isdigit():
+            raise ValueError(value)
+        offset = timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+        tz = timezone(-offset if value[0] == '-' else offset)
+        _timezones[value] = tz
+    return tz
+
+
+def parse_date(value: str) -> datetime:
+    """
+    datetime.strptime(value, DATE_FORMAT), specialised for the fixed layout
+    the api uses ('2021-08-14T22:01:23.456Z'). Values that don't match that
+    layout fall back to strptime.
+    """
+    try:
+        if value[-1] == 'Z':
+            tz_at = len(value) - 1
+        elif value[-3] == ':':
+            tz_at = len(value) - 6
+        else:
+            tz_at = len(value) - 5
+        if (
+            value[4] != '-' or value[7] != '-' or value[10] != 'T' or
+            value[13] != ':' or value[16] != ':' or value[19] != '.' or
+            value[tz_at] not in 'Z+-'
+        ):
+            raise ValueError(value)
+        fraction = value[20:tz_at]
+        if not 0 < len(fraction) <= 6 or not fraction.isdigit():
+            raise ValueError(value)
+        return datetime(
+            int(value[0:4]),
+            int(value[5:7]),
+            int(value[8:10]),
+            int(value[11:13]),
+            int(value[14:16]),
+            int(value[17:19]),
+            int(fraction.ljust(6, '0')),
+            _parse_timezone(value[tz_at:]),
+        )
+    except (IndexError, ValueError):
+        return datetime.strptime(value, DATE_FORMAT)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from array import array
+import asyncio
+import bisect
+import sys
+import time
+
+if TYPE_CHECKING:
+    from . import ApiClient
+
+
+DEFAULT_INTERVAL = 30.0
+
+JOIN = 'join'
+LEAVE = 'leave'
+
+
+class PresenceEvent(NamedTuple):
+    kind: str  # JOIN or LEAVE
+    username: str
+    at: float  # unix time of the poll that saw it
+
+
+class SessionLog:
+    """
+    append-only log of online sessions. Alongside the per-user intervals it
+    keeps a step function of the online count, so concurrency queries are a
+    bisect instead of a scan over raw polls.
+    """
+
+    def __init__(self) -> None:
+        self.usernames: List[str] = []
+        self._ids: Dict[str, int] = {}
+        # closed sessions
+        self.users = array('l')
+        self.starts = array('d')
+        self.ends = array('d')
+        self._by_user: Dict[int, List[int]] = {}
+        # open sessions, user id -> start
+        self.open: Dict[int, float] = {}
+        # online count after each change
+        self.times = array('d')
+        self.counts = array('l')
+
+    def _id(self, username: str) -> int:
+        uid = self._ids.get(username)
+        if uid is None:
+            uid = self._ids[username] = len(self.usernames)
+            self.usernames.append(username)
+        return uid
+
+    def record(self, events: List[PresenceEvent], at: float) -> None:
+        if not events:
+            return
+        for event in events:
+            uid = self._id(event.username)
+            if event.kind == JOIN:
+                self.open[uid] = event.at
+            else:
+                start = self.open.pop(uid, None)
+                if start is not None:
+                    self._by_user.setdefault(uid, []).append(len(self.users))
+                    self.users.append(uid)
+                    self.starts.append(start)
+                    self.ends.append(event.at)
+        self.times.append(at)
+        self.counts.append(len(self.open))
+
+    def concurrent_at(self, at: float) -> int:
+        i = bisect.bisect_right(self.times, at)
+        return self.counts[i - 1] if i else 0
+
+    def concurrent_over(
+        self,
+        since: float,
+        until: float,
+    ) -> List[Tuple[float, int]]:
+        """(time, online count) at since and at every change until `until`"""
+        lo = bisect.bisect_right(self.times, since)
+        hi = bisect.bisect_right(self.times, until)
+        points = [(since, self.concurrent_at(since))]
+        points.extend(zip(self.times[lo:hi], self.counts[lo:hi]))
+        return points
+
+    def sessions(self, username: str) -> List[Tuple[float, Optional[float]]]:
+        """(start, end) of a user's sessions, end is None while online"""
+        uid = self._ids.get(username)
+        if uid is None:
+            return []
+        sessions: List[Tuple[float, Optional[float]]] = [
+            (self.starts[i], self.ends[i])
+            for i in self._by_user.get(uid, ())
+        ]
+        if uid in self.open:
+            sessions.append((self.open[uid], None))
+        return sessions
+
+
+class PresenceTracker:
+    """polls players.json and reports who logged in and out"""
+
+    def __init__(
+        self,
+        client: Optional[ApiClient] = None,
+        *,
+        interval: float = DEFAULT_INTERVAL,
+        log: Optional[SessionLog] = None,
+    ) -> None:
+        self.client = client
+        self.interval = interval
+        self.log = log if log is not None else SessionLog()
+        self.online: FrozenSet[str] = frozenset()
+        self._etag: Optional[str] = None
+
+    def poll(self) -> List[PresenceEvent]:
+        from . import (
+            decode_players,
+            get_client,
+        )
+        client = self.client or get_client()
+        modified, json, self._etag = client.fetch_if_modified(
+            'players.json',
+            self._etag,
+        )
+        if not modified:
+            return []
+
+        at = time.time()
+        intern = sys.intern
+        online = frozenset(intern(u) for u in decode_players(json))
+        events = [
+            PresenceEvent(LEAVE, username, at)
+            for username in self.online - online
+        ]
+        events.extend(
+            PresenceEvent(JOIN, username, at)
+            for username in online - self.online
+        )
+        self.online = online
+        self.log.record(events, at)
+        return events
+
+    def events(self) -> Iterator[PresenceEvent]:
+        """poll forever, yielding events as they are seen"""
+        deadline = time.monotonic()
+        while True:
+            yield from self.poll()
+            deadline += self.interval
+            time.sleep(max(deadline - time.monotonic(), 0.0))
+
+    async def run(self, queue: asyncio.Queue) -> None:
+        """poll forever on a thread, putting events on an asyncio queue"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            for event in await loop.run_in_executor(None, self.poll):
+                await queue.put(event)
+            deadline += self.interval
+            await asyncio.sleep(max(deadline - loop.time(), 0.0))
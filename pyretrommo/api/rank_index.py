@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+from array import array
+import bisect
+import time
+
+if TYPE_CHECKING:
+    from . import (
+        ApiClient,
+        ApiPlayerInfo,
+    )
+    from .frame import LeaderboardFrame
+
+
+# seconds a crawled index is trusted for by default
+DEFAULT_MAX_AGE = 3600.0
+
+
+class RankIndex:
+    """
+    offline rank lookups from a full leaderboard crawl. Experience is kept
+    negated and sorted ascending so bisect finds the number of players with
+    more experience, which is the rank minus one.
+    """
+
+    def __init__(
+        self,
+        players: Iterable[Tuple[str, int]],
+        *,
+        built_at: Optional[float] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+    ) -> None:
+        ordered = sorted(players, key=lambda p: -p[1])
+        self.usernames: List[str] = [username for username, _ in ordered]
+        self._negated = array('q', (-experience for _, experience in ordered))
+        self._experience: Dict[str, int] = dict(ordered)
+        self.built_at = time.time() if built_at is None else built_at
+        self.max_age = max_age
+
+    @classmethod
+    def from_players(
+        cls,
+        players: Iterable[ApiPlayerInfo],
+        **kwargs: float,
+    ) -> RankIndex:
+        return cls(((p.username, p.experience) for p in players), **kwargs)
+
+    @classmethod
+    def from_frame(
+        cls,
+        frame: LeaderboardFrame,
+        **kwargs: float,
+    ) -> RankIndex:
+        return cls(zip(frame.usernames, frame.experience), **kwargs)
+
+    @classmethod
+    def crawl(
+        cls,
+        client: Optional[ApiClient] = None,
+        *,
+        prefetch: int = 4,
+        max_age: float = DEFAULT_MAX_AGE,
+    ) -> RankIndex:
+        from . import iter_leaderboard
+        built_at = time.time()
+        return cls.from_players(
+            iter_leaderboard(1, prefetch, client),
+            built_at=built_at,
+            max_age=max_age,
+        )
+
+    def __len__(self) -> int:
+        return len(self.usernames)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._experience
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.built_at
+
+    @property
+    def stale(self) -> bool:
+        return self.age > self.max_age
+
+    def rank_of(self, experience: int) -> int:
+        """rank a player with this much experience would have"""
+        return bisect.bisect_left(self._negated, -experience) + 1
+
+    def rank(self, username: str) -> int:
+        return self.rank_of(self._experience[username])
+
+    def percentile(self, username: str) -> float:
+        """percent of players with at most this user's experience"""
+        ahead = bisect.bisect_left(self._negated, -self._experience[username])
+        return 100.0 * (len(self) - ahead) / len(self)
+
+    def top_k(self, n: int) -> List[Tuple[str, int]]:
+        return [
+            (username, -negated)
+            for username, negated in zip(self.usernames[:n], self._negated[:n])
+        ]
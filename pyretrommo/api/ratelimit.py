@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Dict,
+    Optional,
+)
+from email.utils import parsedate_to_datetime
+import threading
+import time
+
+from .cache import endpoint_name
+
+
+# requests per second, keyed by endpoint_name()
+DEFAULT_RATES: Dict[str, float] = {
+    'players': 2.0,
+    'registered-users': 2.0,
+    'leaderboards': 10.0,
+    'users': 50.0,
+}
+
+# adaptive backoff: the rate is multiplied by BACKOFF_FACTOR on a throttled
+# response and regains RECOVERY_STEP of its configured rate per success.
+BACKOFF_FACTOR = 0.5
+RECOVERY_STEP = 0.05
+MIN_RATE_FRACTION = 0.05
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header (seconds or an http date) -> seconds from now"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+class TokenBucket:
+    """
+    thread-safe token bucket. Callers reserve a token and are told how long
+    to wait for it, so nobody sleeps while holding the lock and the same
+    bucket works for threads and asyncio tasks.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """take a token, returning the seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+            self.tokens = min(self.tokens + elapsed * self.rate, self.capacity)
+            self.tokens -= 1
+            wait = max(self.blocked_until - now, 0.0)
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.rate)
+            return wait
+
+    def backoff(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.rate = max(
+                self.rate * BACKOFF_FACTOR,
+                self.max_rate * MIN_RATE_FRACTION,
+            )
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after is not None:
+                self.blocked_until = max(
+                    self.blocked_until,
+                    time.monotonic() + retry_after,
+                )
+
+    def recover(self) -> None:
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(
+                self.rate + self.max_rate * RECOVERY_STEP,
+                self.max_rate,
+            )
+
+
+class RateLimiter:
+    """
+    one TokenBucket per endpoint kind. pyretrommo.api.aio sends requests
+    through an ApiClient, so its tasks share the client's limiter too.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        default_rate: float = 10.0,
+    ) -> None:
+        self.rates = dict(DEFAULT_RATES)
+        if rates is not None:
+            self.rates.update(rates)
+        self.default_rate = default_rate
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        name = endpoint_name(endpoint)
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(name)
+                if bucket is None:
+                    rate = self.rates.get(name, self.default_rate)
+                    bucket = self._buckets[name] = TokenBucket(rate)
+        return bucket
+
+    def acquire(self, endpoint: str) -> None:
+        wait = self.bucket(endpoint).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self, endpoint: str) -> None:
+        self.bucket(endpoint).recover()
+
+    def on_throttled(
+        self,
+        endpoint: str,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        self.bucket(endpoint).backoff(retry_after)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Callable,
+    Dict,
+    TypeVar,
+)
+from concurrent.futures import Future
+import threading
+
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """
+    deduplicates concurrent calls: while a call for a key is running, other
+    threads asking for the same key wait for it and share its result.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
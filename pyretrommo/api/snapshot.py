@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+import pathlib
+import sqlite3
+import threading
+import time
+
+if TYPE_CHECKING:
+    from . import (
+        ApiClient,
+        ApiPlayerInfo,
+    )
+
+
+# Local store of leaderboard crawls. `players` holds the latest known state
+# of each user (and the crawl that last changed it) and `history` only gets a
+# row when a user's experience or rank changed. Unchanged players aren't
+# written at all, so storage and write volume grow with activity rather than
+# with crawl count.
+
+
+# experience, permissions, rank, registered_at, time_played
+_PlayerRow = Tuple[int, int, Optional[int], Optional[float], Optional[int]]
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS crawls (
+    id INTEGER PRIMARY KEY,
+    crawled_at REAL NOT NULL,
+    rows INTEGER NOT NULL DEFAULT 0,
+    changed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS players (
+    username TEXT PRIMARY KEY,
+    experience INTEGER NOT NULL,
+    permissions INTEGER NOT NULL,
+    rank INTEGER,
+    registered_at REAL,
+    time_played INTEGER,
+    crawl INTEGER NOT NULL REFERENCES crawls (id)
+);
+CREATE TABLE IF NOT EXISTS history (
+    username TEXT NOT NULL,
+    crawl INTEGER NOT NULL REFERENCES crawls (id),
+    crawled_at REAL NOT NULL,
+    experience INTEGER NOT NULL,
+    rank INTEGER
+);
+CREATE INDEX IF NOT EXISTS history_user_time
+    ON history (username, crawled_at);
+CREATE INDEX IF NOT EXISTS history_time
+    ON history (crawled_at);
+'''
+
+
+class HistoryPoint(NamedTuple):
+    crawled_at: datetime
+    experience: int
+    rank: Optional[int]
+
+
+class Change(NamedTuple):
+    crawled_at: datetime
+    username: str
+    experience: int
+    rank: Optional[int]
+
+
+class CrawlResult(NamedTuple):
+    crawl: int
+    rows: int
+    changed: int
+
+
+def _epoch(when: Optional[datetime]) -> Optional[float]:
+    return None if when is None else when.timestamp()
+
+
+def _range(
+    since: Optional[datetime],
+    until: Optional[datetime],
+) -> Tuple[float, float]:
+    return (
+        float('-inf') if since is None else since.timestamp(),
+        float('inf') if until is None else until.timestamp(),
+    )
+
+
+def _datetime(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+class SnapshotStore:
+
+    def __init__(self, path: Union[str, pathlib.Path]) -> None:
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    def __enter__(self) -> SnapshotStore:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def refresh(
+        self,
+        client: Optional[ApiClient] = None,
+        *,
+        prefetch: int = 4,
+    ) -> CrawlResult:
+        """crawl the whole leaderboard and record what changed"""
+        from . import iter_leaderboard
+        crawled_at = time.time()
+        return self.record(
+            iter_leaderboard(1, prefetch, client),
+            crawled_at,
+            ranked=True,
+        )
+
+    def record(
+        self,
+        players: Iterable[ApiPlayerInfo],
+        crawled_at: Optional[float] = None,
+        *,
+        ranked: bool = False,
+    ) -> CrawlResult:
+        """
+        store a crawl of players (from get_leaderboard or get_player). With
+        ranked=True players are in leaderboard order and their position is
+        used as the rank when it isn't populated.
+        """
+        crawled_at = time.time() if crawled_at is None else crawled_at
+        # finish fetching before taking the lock
+        players = list(players)
+        with self._lock:
+            known: Dict[str, _PlayerRow] = {
+                row[0]: row[1:]
+                for row in self._db.execute(
+                    'SELECT username, experience, permissions, rank,'
+                    ' registered_at, time_played FROM players'
+                )
+            }
+            cursor = self._db.execute(
+                'INSERT INTO crawls (crawled_at) VALUES (?)',
+                (crawled_at,),
+            )
+            crawl = cursor.lastrowid
+
+            rows = 0
+            changes = []
+            updates = []
+            for position, player in enumerate(players, 1):
+                rows += 1
+                rank = player._rank
+                if rank is None and ranked:
+                    rank = position
+                registered_at = _epoch(player._registered_at)
+                seconds = None
+                if player._time_played is not None:
+                    seconds = int(player._time_played.total_seconds())
+                old = known.get(player.username)
+                if old is not None:
+                    # keep previously fetched details that this row lacks,
+                    # the same COALESCE the upsert below applies
+                    rank = old[2] if rank is None else rank
+                    if registered_at is None:
+                        registered_at = old[3]
+                    seconds = old[4] if seconds is None else seconds
+                row: _PlayerRow = (
+                    player.experience,
+                    player.permissions,
+                    rank,
+                    registered_at,
+                    seconds,
+                )
+                if row == old:
+                    continue
+                known[player.username] = row
+                updates.append((player.username, *row, crawl))
+                if old is None or old[0] != row[0] or old[2] != row[2]:
+                    changes.append((
+                        player.username,
+                        crawl,
+                        crawled_at,
+                        row[0],
+                        row[2],
+                    ))
+
+            self._db.executemany(
+                'INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (username) DO UPDATE SET '
+                ' experience = excluded.experience,'
+                ' permissions = excluded.permissions,'
+                ' rank = COALESCE(excluded.rank, rank),'
+                ' registered_at = COALESCE(excluded.registered_at,'
+                '                          registered_at),'
+                ' time_played = COALESCE(excluded.time_played, time_played),'
+                ' crawl = excluded.crawl',
+                updates,
+            )
+            self._db.executemany(
+                'INSERT INTO history VALUES (?, ?, ?, ?, ?)',
+                changes,
+            )
+            self._db.execute(
+                'UPDATE crawls SET rows = ?, changed = ? WHERE id = ?',
+                (rows, len(changes), crawl),
+            )
+            self._db.commit()
+        return CrawlResult(crawl, rows, len(changes))
+
+    def latest(self, username: str) -> Optional[ApiPlayerInfo]:
+        from . import ApiPlayerInfo
+        with self._lock:
+            row = self._db.execute(
+                'SELECT username, experience, permissions, rank,'
+                ' registered_at, time_played FROM players WHERE username = ?',
+                (username,),
+            ).fetchone()
+        if row is None:
+            return None
+        username, experience, permissions, rank, registered, played = row
+        return ApiPlayerInfo(
+            username,
+            experience,
+            permissions,
+            rank,
+            None if registered is None else _datetime(registered),
+            None if played is None else timedelta(seconds=played),
+        )
+
+    def experience_history(
+        self,
+        username: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[HistoryPoint]:
+        """every recorded change for a user, oldest first"""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT crawled_at, experience, rank FROM history'
+                ' WHERE username = ? AND crawled_at >= ? AND crawled_at <= ?'
+                ' ORDER BY crawled_at',
+                (username, *_range(since, until)),
+            ).fetchall()
+        return [
+            HistoryPoint(_datetime(at), experience, rank)
+            for at, experience, rank in rows
+        ]
+
+    def changes(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Change]:
+        """changes of all users within a time range, oldest first"""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT crawled_at, username, experience, rank FROM history'
+                ' WHERE crawled_at >= ? AND crawled_at <= ?'
+                ' ORDER BY crawled_at',
+                _range(since, until),
+            ).fetchall()
+        return [
+            Change(_datetime(at), username, experience, rank)
+            for at, username, experience, rank in rows
+        ]
+
+    def crawls(self) -> List[CrawlResult]:
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT id, rows, changed FROM crawls ORDER BY id'
+            ).fetchall()
+        return [CrawlResult(*row) for row in rows]
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+import gzip
+import json
+import pathlib
+import threading
+import time
+
+import requests
+
+
+# Transports send the actual http requests for an ApiClient. Besides the
+# default requests.Session transport, responses can be recorded to a gzipped
+# json-lines cassette and replayed later without touching the network:
+#
+#   client = ApiClient(transport=RecordingTransport('crawl.cassette'))
+#   ...
+#   client.transport.save()
+#   client = ApiClient(transport=ReplayTransport('crawl.cassette'))
+
+
+Timeout = Union[float, Tuple[float, float]]
+
+# response headers worth keeping in a cassette
+RECORDED_HEADERS = ('ETag', 'Retry-After', 'Content-Type')
+
+
+class CassetteError(LookupError):
+    ...
+
+
+class Response:
+    """the parts of requests.Response that ApiClient uses"""
+
+    __slots__ = ('status_code', 'content', 'headers', 'elapsed')
+
+    def __init__(
+        self,
+        status_code: int,
+        content: bytes,
+        headers: Mapping[str, str],
+        elapsed: float = 0.0,
+    ) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.elapsed = elapsed
+
+
+class Transport:
+
+    # whether an ApiClient should rate limit requests sent through this by
+    # default, off for transports that never reach the server
+    rate_limited = True
+
+    def get(
+        self,
+        endpoint: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        timeout: Timeout,
+    ) -> Any:
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        pass
+
+
+class SessionTransport(Transport):
+
+    def __init__(self, session: requests.Session) -> None:
+        self.session = session
+
+    def get(
+        self,
+        endpoint: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        timeout: Timeout,
+    ) -> requests.Response:
+        return self.session.get(url, headers=headers, timeout=timeout)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class RecordingTransport(Transport):
+    """
+    forwards to another transport and records every response. Without an
+    inner transport, an ApiClient given this one sends through its own
+    session (so its pool and retry settings apply).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path],
+        inner: Optional[Transport] = None,
+    ) -> None:
+        self.path = pathlib.Path(path)
+        self.inner = inner
+        self.entries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        endpoint: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        timeout: Timeout,
+    ) -> Any:
+        if self.inner is None:
+            self.inner = SessionTransport(requests.Session())
+        start = time.perf_counter()
+        r = self.inner.get(endpoint, url, headers, timeout)
+        elapsed = time.perf_counter() - start
+        entry = {
+            'endpoint': endpoint,
+            'status': r.status_code,
+            'headers': {
+                k: r.headers[k] for k in RECORDED_HEADERS if k in r.headers
+            },
+            'body': r.content.decode('utf-8'),
+            'elapsed': round(elapsed, 6),
+        }
+        with self._lock:
+            self.entries.append(entry)
+        return r
+
+    def save(self) -> None:
+        with self._lock:
+            entries = list(self.entries)
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(',', ':')))
+                f.write('\n')
+
+    def close(self) -> None:
+        self.save()
+        if self.inner is not None:
+            self.inner.close()
+
+
+class ReplayTransport(Transport):
+    """
+    serves responses from a cassette. Each endpoint replays its recorded
+    responses in order and then keeps repeating the last one.
+    """
+
+    rate_limited = False
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path],
+        *,
+        simulate_latency: bool = False,
+        latency_scale: float = 1.0,
+    ) -> None:
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self.responses: Dict[str, List[Response]] = {}
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                self.responses.setdefault(entry['endpoint'], []).append(
+                    Response(
+                        entry['status'],
+                        entry['body'].encode('utf-8'),
+                        entry['headers'],
+                        entry['elapsed'],
+                    )
+                )
+
+    def get(
+        self,
+        endpoint: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        timeout: Timeout,
+    ) -> Response:
+        responses = self.responses.get(endpoint)
+        if responses is None:
+            raise CassetteError(f'{endpoint} is not in the cassette')
+        with self._lock:
+            i = self._next.get(endpoint, 0)
+            self._next[endpoint] = min(i + 1, len(responses) - 1)
+        r = responses[i]
+        if self.simulate_latency and r.elapsed > 0:
+            time.sleep(r.elapsed * self.latency_scale)
+        return r
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._next.clear()
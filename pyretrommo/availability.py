@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .gen.ability import Ability
+from .gen.class_bits import (
+    ABILITY_BITS,
+    ABILITY_ORDER,
+    EQUIPMENT_BITS,
+    EQUIPMENT_ORDER,
+    members,
+)
+from .gen.player_class import PlayerClass
+from .item import EquipmentItem
+
+
+# Which class gets which ability or item, and from which level, using the
+# generated per (class, level) bitsets in gen/class_bits.py:
+#
+#   required_level(PlayerClass.Wizard, Ability.Teleport)
+#   classes_for(MainHandEquipment.TrainingWand)
+#   party_abilities([(PlayerClass.Cleric, 4), (PlayerClass.Wizard, 6)])
+
+
+Availability = Union[Ability, EquipmentItem]
+Member = Tuple[PlayerClass, int]  # class and level
+
+ABILITY_BIT: Dict[Ability, int] = {
+    ability: 1 << i for i, ability in enumerate(ABILITY_ORDER)
+}
+EQUIPMENT_BIT: Dict[EquipmentItem, int] = {
+    item: 1 << i for i, item in enumerate(EQUIPMENT_ORDER)
+}
+
+
+def _at(masks: Tuple[int, ...], level: int) -> int:
+    if level < 0:
+        return 0
+    return masks[min(level, len(masks) - 1)]
+
+
+def ability_mask(player_class: PlayerClass, level: int) -> int:
+    return _at(ABILITY_BITS[player_class], level)
+
+
+def equipment_mask(player_class: PlayerClass, level: int) -> int:
+    return _at(EQUIPMENT_BITS[player_class], level)
+
+
+def _lookup(thing: Availability) -> Tuple[Dict[PlayerClass, Tuple[int, ...]], int]:
+    if isinstance(thing, Ability):
+        return ABILITY_BITS, ABILITY_BIT[thing]
+    return EQUIPMENT_BITS, EQUIPMENT_BIT.get(thing, 0)
+
+
+def can_use(
+    player_class: PlayerClass,
+    level: int,
+    thing: Availability,
+) -> bool:
+    bits, bit = _lookup(thing)
+    return bool(_at(bits[player_class], level) & bit)
+
+
+def required_level(
+    player_class: PlayerClass,
+    thing: Availability,
+) -> Optional[int]:
+    """the lowest level at which the class has it, None if never"""
+    bits, bit = _lookup(thing)
+    masks = bits[player_class]
+    if not masks[-1] & bit:
+        return None
+    # masks only gain bits as level goes up
+    lo, hi = 0, len(masks) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if masks[mid] & bit:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def classes_for(thing: Availability) -> Dict[PlayerClass, int]:
+    """every class that can get it, with the level it needs"""
+    found = {}
+    for player_class in PlayerClass:
+        level = required_level(player_class, thing)
+        if level is not None:
+            found[player_class] = level
+    return found
+
+
+def party_abilities(party: Iterable[Member]) -> Tuple[Ability, ...]:
+    """abilities at least one member has"""
+    mask = 0
+    for player_class, level in party:
+        mask |= ability_mask(player_class, level)
+    return members(ABILITY_ORDER, mask)
+
+
+def shared_abilities(party: Iterable[Member]) -> Tuple[Ability, ...]:
+    """abilities every member has"""
+    mask = -1
+    for player_class, level in party:
+        mask &= ability_mask(player_class, level)
+    return members(ABILITY_ORDER, mask) if mask != -1 else ()
+
+
+def party_equipment(party: Iterable[Member]) -> Tuple[EquipmentItem, ...]:
+    """equipment at least one member can use"""
+    mask = 0
+    for player_class, level in party:
+        mask |= equipment_mask(player_class, level)
+    return members(EQUIPMENT_ORDER, mask)
+
+
+def shared_equipment(party: Iterable[Member]) -> Tuple[EquipmentItem, ...]:
+    """equipment every member can use, e.g. for passing around loot"""
+    mask = -1
+    for player_class, level in party:
+        mask &= equipment_mask(player_class, level)
+    return members(EQUIPMENT_ORDER, mask) if mask != -1 else ()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+import bisect
+
+from .gen.equipment import (
+    EQUIPMENT_BY_NAME,
+    equipment_key,
+)
+from .item import EquipmentItem
+
+
+# Lookups for user-typed item names, from chat or trade logs. Exact lookups
+# (any case, spacing or punctuation) are gen.equipment.find_equipment, a
+# single dict hit. This adds aliases, prefix matches and trigram fuzzy
+# matches on top of the same table:
+#
+#   add_alias('tenderizer', MainHandEquipment.TheTenderizer)
+#   find_prefix('leather')  # [LeatherArmor, LeatherCap]
+#   find_fuzzy('jaged crown')  # [(JaggedCrown, 0.77)]
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+
+    def __init__(self, names: Dict[str, EquipmentItem]) -> None:
+        # shared, aliases added here are seen by find_equipment too
+        self.names = names
+        self._keys: List[str] = sorted(names)
+        self._trigrams: Dict[str, Set[str]] = {}
+        for key in self._keys:
+            self._add_trigrams(key)
+
+    def _add_trigrams(self, key: str) -> None:
+        for trigram in trigrams(key):
+            self._trigrams.setdefault(trigram, set()).add(key)
+
+    def get(self, name: str) -> Optional[EquipmentItem]:
+        return self.names.get(equipment_key(name))
+
+    def add_alias(self, alias: str, item: EquipmentItem) -> None:
+        key = equipment_key(alias)
+        if not key:
+            raise ValueError(f'invalid alias: {alias!r}')
+        existing = self.names.get(key)
+        if existing is item:
+            return
+        if existing is not None:
+            raise ValueError(f'{alias!r} already names {existing.itemname}')
+        self.names[key] = item
+        bisect.insort(self._keys, key)
+        self._add_trigrams(key)
+
+    def prefix(self, prefix: str) -> List[EquipmentItem]:
+        """items with a name or alias starting with prefix"""
+        key = equipment_key(prefix)
+        found: List[EquipmentItem] = []
+        i = bisect.bisect_left(self._keys, key)
+        while i < len(self._keys) and self._keys[i].startswith(key):
+            item = self.names[self._keys[i]]
+            if item not in found:
+                found.append(item)
+            i += 1
+        return found
+
+    def fuzzy(
+        self,
+        name: str,
+        limit: int = 5,
+        cutoff: float = 0.3,
+    ) -> List[Tuple[EquipmentItem, float]]:
+        """closest items by trigram similarity (0 to 1), best first"""
+        key = equipment_key(name)
+        wanted = trigrams(key)
+        shared: Dict[str, int] = {}
+        for trigram in wanted:
+            for other in self._trigrams.get(trigram, ()):
+                shared[other] = shared.get(other, 0) + 1
+
+        best: Dict[EquipmentItem, float] = {}
+        for other, count in shared.items():
+            score = count / (len(wanted) + len(trigrams(other)) - count)
+            item = self.names[other]
+            if score >= cutoff and score > best.get(item, 0.0):
+                best[item] = score
+        ranked = sorted(best.items(), key=lambda x: x[1], reverse=True)
+        return ranked[:limit]
+
+
+EQUIPMENT_INDEX = NameIndex(EQUIPMENT_BY_NAME)
+
+
+def add_alias(alias: str, item: EquipmentItem) -> None:
+    EQUIPMENT_INDEX.add_alias(alias, item)
+
+
+def find_prefix(prefix: str) -> List[EquipmentItem]:
+    return EQUIPMENT_INDEX.prefix(prefix)
+
+
+def find_fuzzy(
+    name: str,
+    limit: int = 5,
+    cutoff: float = 0.3,
+) -> List[Tuple[EquipmentItem, float]]:
+    return EQUIPMENT_INDEX.fuzzy(name, limit, cutoff)
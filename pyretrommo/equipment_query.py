@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+import bisect
+
+from .gen.class_bits import (
+    EQUIPMENT_BITS,
+    EQUIPMENT_ORDER,
+)
+from .gen.equipment_slot import EquipmentSlot
+from .gen.player_class import PlayerClass
+from .item import EquipmentItem
+from .stats import Stats
+
+
+# Compound queries over the equipment catalog:
+#
+#   (EQUIPMENT.query()
+#       .slot(EquipmentSlot.MainHand)
+#       .usable_by(PlayerClass.Wizard, 6)
+#       .where('intelligence', min=2)
+#       .order_by('sell_value'))
+#
+# Every filter is an int bitmask over item ids. Item ids are the bits of the
+# generated per (class, level) masks in gen/class_bits.py, slot masks are
+# precomputed, and each numeric field keeps its ids sorted with cumulative
+# masks, so a range filter is two bisects and an AND no matter how many items
+# there are. Ordered results break ties by id.
+
+
+FIELDS: Tuple[str, ...] = Stats._fields + ('sell_value',)
+
+
+def _field(name: str) -> Callable[[EquipmentItem], int]:
+    if name == 'sell_value':
+        return lambda item: item.sell_value
+    if name not in Stats._fields:
+        raise ValueError(f'unknown field: {name}')
+    i = Stats._fields.index(name)
+    return lambda item: item.stats[i]
+
+
+class _RangeIndex:
+    """one field's ids sorted by value, with masks of every suffix/prefix"""
+
+    def __init__(self, values: List[int]) -> None:
+        # ties keep ids ascending in both directions
+        self.order = sorted(range(len(values)), key=values.__getitem__)
+        self.descending = sorted(
+            range(len(values)),
+            key=lambda i: -values[i],
+        )
+        self.values = [values[i] for i in self.order]
+        n = len(self.order)
+        # ge[i]: ids of order[i:], le[i]: ids of order[:i]
+        self.ge = [0] * (n + 1)
+        self.le = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            self.ge[i] = self.ge[i + 1] | (1 << self.order[i])
+        for i in range(n):
+            self.le[i + 1] = self.le[i] | (1 << self.order[i])
+
+    def mask(self, lo: Optional[int], hi: Optional[int]) -> int:
+        mask = self.ge[0]
+        if lo is not None:
+            mask &= self.ge[bisect.bisect_left(self.values, lo)]
+        if hi is not None:
+            mask &= self.le[bisect.bisect_right(self.values, hi)]
+        return mask
+
+
+class EquipmentCatalog:
+
+    def __init__(
+        self,
+        items: Iterable[EquipmentItem],
+        class_bits: Dict[PlayerClass, Tuple[int, ...]],
+    ) -> None:
+        """
+        class_bits are each class's masks by level, bit i meaning items[i],
+        like gen.class_bits.EQUIPMENT_BITS over EQUIPMENT_ORDER
+        """
+        self.items: Tuple[EquipmentItem, ...] = tuple(items)
+        self.ids: Dict[EquipmentItem, int] = {
+            item: i for i, item in enumerate(self.items)
+        }
+        self.all = (1 << len(self.items)) - 1
+
+        self.slots: Dict[EquipmentSlot, int] = {}
+        self.tradable = 0
+        for i, item in enumerate(self.items):
+            self.slots[item.slot] = self.slots.get(item.slot, 0) | (1 << i)
+            if item.tradable:
+                self.tradable |= 1 << i
+
+        self.class_bits = class_bits
+        # everything each class gets by its highest level
+        self.classes: Dict[PlayerClass, int] = {
+            player_class: masks[-1] if masks else 0
+            for player_class, masks in class_bits.items()
+        }
+
+        self._ranges = {
+            name: _RangeIndex([_field(name)(item) for item in self.items])
+            for name in FIELDS
+        }
+
+    def query(self) -> EquipmentQuery:
+        return EquipmentQuery(self, self.all)
+
+    def usable_mask(self, player_class: PlayerClass, level: int) -> int:
+        masks = self.class_bits.get(player_class, ())
+        if level < 0 or not masks:
+            return 0
+        return masks[min(level, len(masks) - 1)]
+
+    def range_mask(
+        self,
+        field: str,
+        lo: Optional[int] = None,
+        hi: Optional[int] = None,
+    ) -> int:
+        if field not in self._ranges:
+            raise ValueError(f'unknown field: {field}')
+        return self._ranges[field].mask(lo, hi)
+
+    def members(self, mask: int) -> Iterator[int]:
+        """ids set in mask, ascending"""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+
+class EquipmentQuery:
+    """
+    an immutable, chainable filter. Each method returns a new query; results
+    come from all(), first(), count() or iterating.
+    """
+
+    __slots__ = ('index', 'mask', '_order')
+
+    def __init__(
+        self,
+        index: EquipmentCatalog,
+        mask: int,
+        order: Optional[Tuple[str, bool]] = None,
+    ) -> None:
+        self.index = index
+        self.mask = mask
+        self._order = order
+
+    def _filter(self, mask: int) -> EquipmentQuery:
+        return EquipmentQuery(self.index, self.mask & mask, self._order)
+
+    def slot(self, *slots: EquipmentSlot) -> EquipmentQuery:
+        mask = 0
+        for slot in slots:
+            mask |= self.index.slots.get(slot, 0)
+        return self._filter(mask)
+
+    def usable_by(
+        self,
+        player_class: PlayerClass,
+        level: Optional[int] = None,
+    ) -> EquipmentQuery:
+        """items the class can use, at or below level if given"""
+        if level is None:
+            return self._filter(self.index.classes.get(player_class, 0))
+        return self._filter(self.index.usable_mask(player_class, level))
+
+    def where(
+        self,
+        field: str,
+        min: Optional[int] = None,
+        max: Optional[int] = None,
+    ) -> EquipmentQuery:
+        """min <= field <= max, field is a stat name or sell_value"""
+        return self._filter(self.index.range_mask(field, min, max))
+
+    def tradable(self, tradable: bool = True) -> EquipmentQuery:
+        mask = self.index.tradable
+        return self._filter(mask if tradable else self.index.all & ~mask)
+
+    def order_by(self, field: str, descending: bool = False) -> EquipmentQuery:
+        if field not in FIELDS:
+            raise ValueError(f'unknown field: {field}')
+        return EquipmentQuery(self.index, self.mask, (field, descending))
+
+    def count(self) -> int:
+        return bin(self.mask).count('1')
+
+    def ids(self) -> List[int]:
+        if self._order is None:
+            return list(self.index.members(self.mask))
+        field, descending = self._order
+        ranges = self.index._ranges[field]
+        if self.count() * 8 < len(ranges.order):
+            # few matches, sorting them beats walking the whole order
+            key = _field(field)
+            items = self.index.items
+            sign = -1 if descending else 1
+            # members() is ascending, so the stable sort keeps ties by id
+            return sorted(
+                self.index.members(self.mask),
+                key=lambda i: sign * key(items[i]),
+            )
+        order = ranges.descending if descending else ranges.order
+        return [i for i in order if self.mask >> i & 1]
+
+    def all(self) -> List[EquipmentItem]:
+        items = self.index.items
+        return [items[i] for i in self.ids()]
+
+    def first(self) -> Optional[EquipmentItem]:
+        ids = self.ids()
+        return self.index.items[ids[0]] if ids else None
+
+    def __iter__(self) -> Iterator[EquipmentItem]:
+        return iter(self.all())
+
+    def __len__(self) -> int:
+        return self.count()
+
+
+EQUIPMENT = EquipmentCatalog(EQUIPMENT_ORDER, EQUIPMENT_BITS)
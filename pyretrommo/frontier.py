@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+import bisect
+import functools
+
+from .gen.equipment import GearType
+from .gen.player_class import PlayerClass
+from .gen.player_stats import STATS_BY_PLAYER_CLASS
+from .item import EquipmentItem
+from .optimize import (
+    STAT_NAMES,
+    slot_candidates,
+)
+from .player import as_gear
+from .stats import (
+    Stats,
+    ZERO_STATS,
+)
+
+
+# Pareto frontier of gear sets: every set that no other set beats or ties in
+# all eight stats while beating it in at least one. Frontiers are generated
+# into gen/gear_frontier.py by gen_from_wiki.py, and computed on first use
+# for anything missing from there.
+#
+#   front = gear_frontier(PlayerClass.Warrior, 10)
+#   front.where(defense=20, strength=15)
+
+
+class FrontierEntry(NamedTuple):
+    gear: GearType
+    stats: Stats  # gear stats only, without base stats or boosts
+
+
+# the first few slots of a set, while compute_frontier builds it
+PartialGear = Tuple[Optional[EquipmentItem], ...]
+
+
+class PartialSet(NamedTuple):
+    gear: PartialGear
+    stats: Stats
+
+
+Entry = TypeVar('Entry', FrontierEntry, PartialSet)
+
+
+def _dominates(a: Stats, b: Stats) -> bool:
+    return a != b and all(x >= y for x, y in zip(a, b))
+
+
+def pareto_filter(entries: Iterable[Entry]) -> List[Entry]:
+    """entries not dominated by any other, sets with equal stats all stay"""
+    # a set can only be dominated by one with a larger stat total, so after
+    # sorting by total only the kept entries need checking
+    ordered = sorted(entries, key=lambda e: sum(e.stats), reverse=True)
+    kept: List[Entry] = []
+    for entry in ordered:
+        if not any(_dominates(k.stats, entry.stats) for k in kept):
+            kept.append(entry)
+    return kept
+
+
+def compute_frontier(
+    items: Iterable[EquipmentItem],
+) -> List[FrontierEntry]:
+    """
+    the frontier of every gear set made from items. Domination survives
+    adding the same item to both sides, so slots are merged one at a time
+    and filtered after each, instead of filtering the full product.
+    """
+    front = [PartialSet((), ZERO_STATS)]
+    for options in slot_candidates(items):
+        slot = pareto_filter(
+            PartialSet(
+                (item,),
+                ZERO_STATS if item is None else item.stats,
+            )
+            for item in options
+        )
+        front = pareto_filter(
+            PartialSet(a.gear + b.gear, a.stats + b.stats)
+            for a in front
+            for b in slot
+        )
+    return [FrontierEntry(as_gear(p.gear), p.stats) for p in front]
+
+
+class Frontier:
+    """the frontier for one class and level, with per-stat sorted indexes"""
+
+    def __init__(
+        self,
+        player_class: PlayerClass,
+        level: int,
+        gear: Iterable[GearType],
+    ) -> None:
+        self.player_class = player_class
+        self.level = level
+        self.base = STATS_BY_PLAYER_CLASS[player_class][level]
+        self.entries: Tuple[FrontierEntry, ...] = tuple(
+            FrontierEntry(g, _gear_stats(g)) for g in gear
+        )
+        # per stat, entry indices sorted by that stat and the sorted values
+        self._order: List[List[int]] = []
+        self._values: List[List[int]] = []
+        for s in range(len(STAT_NAMES)):
+            order = sorted(
+                range(len(self.entries)),
+                key=lambda i: self.entries[i].stats[s],
+            )
+            self._order.append(order)
+            self._values.append([self.entries[i].stats[s] for i in order])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[FrontierEntry]:
+        return iter(self.entries)
+
+    def __repr__(self) -> str:
+        return (
+            f'<Frontier: {self.player_class.name} level {self.level}, '
+            f'{len(self)} sets>'
+        )
+
+    def where(
+        self,
+        minimums: Optional[Mapping[str, int]] = None,
+        *,
+        totals: bool = True,
+        **kwargs: int,
+    ) -> List[FrontierEntry]:
+        """
+        sets with at least the given stats. With totals (the default) the
+        minimums include the class's base stats, otherwise only gear stats.
+        """
+        wanted = dict(minimums or {}, **kwargs)
+        unknown = set(wanted) - set(STAT_NAMES)
+        if unknown:
+            raise ValueError(f'unknown stats: {sorted(unknown)}')
+        if not wanted:
+            return list(self.entries)
+
+        bounds = []
+        for name, value in wanted.items():
+            s = STAT_NAMES.index(name)
+            if totals:
+                value -= self.base[s]
+            start = bisect.bisect_left(self._values[s], value)
+            bounds.append((len(self._values[s]) - start, s, start, value))
+        # scan from the most selective stat's index
+        _, s, start, _ = min(bounds)
+        return [
+            self.entries[i] for i in sorted(self._order[s][start:])
+            if all(self.entries[i].stats[t] >= v for _, t, _, v in bounds)
+        ]
+
+
+def _gear_stats(gear: GearType) -> Stats:
+    stats = ZERO_STATS
+    for item in gear:
+        if item is not None:
+            stats += item.stats
+    return stats
+
+
+@functools.lru_cache(maxsize=None)
+def gear_frontier(player_class: PlayerClass, level: int) -> Frontier:
+    """the frontier of gear a class can wear at a level"""
+    try:
+        from .gen.gear_frontier import GEAR_FRONTIER
+        gear: Sequence[GearType] = GEAR_FRONTIER[player_class][level]
+    except (ImportError, KeyError, IndexError):
+        gear = [
+            entry.gear for entry in compute_frontier(
+                PlayerClass.get_equipment(player_class, level)
+            )
+        ]
+    return Frontier(player_class, level, gear)
+
+
+def all_frontiers() -> Dict[PlayerClass, List[List[GearType]]]:
+    """every class and level's frontier, for gen_from_wiki.py"""
+    return {
+        player_class: [
+            [
+                entry.gear for entry in compute_frontier(
+                    PlayerClass.get_equipment(player_class, level)
+                )
+            ]
+            for level in range(len(STATS_BY_PLAYER_CLASS[player_class]))
+        ]
+        for player_class in PlayerClass
+    }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# this file is auto-generated by gen_from_wiki.py
+from __future__ import annotations
+from typing import (
+    Dict,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+from ..item import EquipmentItem
+from .ability import Ability
+from .equipment import find_equipment
+from .player_class import PlayerClass
+
+
+# bit i of an ability mask is ABILITY_ORDER[i]
+ABILITY_ORDER: Tuple[Ability, ...] = (
+    Ability.ArrowVolley,
+    Ability.Attack,
+    Ability.ChargedPound,
+    Ability.Escape,
+    Ability.Explode,
+    Ability.EyeBeam,
+    Ability.Fireball,
+    Ability.Firewall,
+    Ability.Guard,
+    Ability.Heal,
+    Ability.HealWave,
+    Ability.IceShard,
+    Ability.Juggle,
+    Ability.Pass,
+    Ability.Smite,
+    Ability.Teleport,
+    Ability.Vitality,
+    Ability.WideSweep,
+    Ability.WingFlap,
+)
+
+# bit i of an equipment mask is EQUIPMENT_ORDER[i]
+EQUIPMENT_ORDER: Tuple[EquipmentItem, ...] = (
+    find_equipment('BoneBracelet'),
+    find_equipment('NimbleBracelet'),
+    find_equipment('SimpleBracelet'),
+    find_equipment('StuddedShield'),
+    find_equipment('WoodenShield'),
+    find_equipment('CrookedWand'),
+    find_equipment('CypressStick'),
+    find_equipment('DimitrisScythe'),
+    find_equipment('DimitrisTooth'),
+    find_equipment('OakenClub'),
+    find_equipment('RustyDagger'),
+    find_equipment('TheTenderizer'),
+    find_equipment('TrainingSword'),
+    find_equipment('TrainingWand'),
+    find_equipment('WishboneWand'),
+    find_equipment('DentedHelm'),
+    find_equipment('JaggedCrown'),
+    find_equipment('LeatherCap'),
+    find_equipment('MageHat'),
+    find_equipment('DimitrisCloak'),
+    find_equipment('LeatherArmor'),
+    find_equipment('PaddedGarb'),
+    find_equipment('PlainClothes'),
+    find_equipment('TatteredCloak'),
+)
+
+
+# everything a class has at each level, indexed by level
+ABILITY_BITS: Dict[PlayerClass, Tuple[int, ...]] = {
+    PlayerClass.Cleric: (0x0, 0x220a, 0x620a, 0x620a, 0x620a, 0x620a, 0x620a, 0x620a, 0x620a, 0x620a, 0x660a),
+    PlayerClass.Warrior: (0x0, 0x210a, 0x210a, 0x210a, 0x210a, 0x210a, 0x210a, 0x210a, 0x210a, 0x210a, 0x210a),
+    PlayerClass.Wizard: (0x0, 0x204a, 0x204a, 0x204a, 0x20ca, 0x120ca, 0x120ca, 0x1a0ca, 0x1a0ca, 0x1a0ca, 0x1a0ca),
+}
+
+EQUIPMENT_BITS: Dict[PlayerClass, Tuple[int, ...]] = {
+    PlayerClass.Cleric: (0x0, 0x420244, 0xe20244, 0xe20244, 0xe22244, 0xe22244, 0xe22664, 0xe22664, 0xe32665, 0xe32665, 0xe32665),
+    PlayerClass.Warrior: (0x0, 0x420250, 0x520250, 0x520250, 0x521250, 0x521250, 0x529258, 0x529258, 0x529a58, 0x529a58, 0x529a58),
+    PlayerClass.Wizard: (0x0, 0x420044, 0xc20044, 0xc20044, 0xc22044, 0xc22044, 0xc62064, 0xc62064, 0xc72065, 0xc72065, 0xc72065),
+}
+
+
+T = TypeVar('T')
+
+
+def members(order: Sequence[T], mask: int) -> Tuple[T, ...]:
+    return tuple(x for i, x in enumerate(order) if mask >> i & 1)
+
+
+# the masks decoded, for PlayerClass.get_abilities and get_equipment
+ABILITIES_AT: Dict[PlayerClass, Tuple[Tuple[Ability, ...], ...]] = {
+    pc: tuple(members(ABILITY_ORDER, m) for m in masks)
+    for pc, masks in ABILITY_BITS.items()
+}
+EQUIPMENT_AT: Dict[PlayerClass, Tuple[Tuple[EquipmentItem, ...], ...]] = {
+    pc: tuple(members(EQUIPMENT_ORDER, m) for m in masks)
+    for pc, masks in EQUIPMENT_BITS.items()
+}
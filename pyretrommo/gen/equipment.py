@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # this file is auto-generated by gen_from_wiki.py
 from __future__ import annotations
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 import enum
 import functools
 
@@ -11,17 +11,15 @@ from .equipment_slot import EquipmentSlot
 from .player_class import PlayerClass
 
 
+def equipment_key(name: str) -> str:
+    return ''.join(c for c in name.lower() if c.isalnum())
+
+
 def find_equipment(name: str) -> EquipmentItem:
-    name = name.replace("'", "\'").title().replace(' ', '')
-    try: return OffHandEquipment[name]
-    except KeyError: pass
-    try: return MainHandEquipment[name]
-    except KeyError: pass
-    try: return HeadEquipment[name]
-    except KeyError: pass
-    try: return BodyEquipment[name]
-    except KeyError: pass
-    raise ValueError(f'invalid equipment: {name}')
+    item = EQUIPMENT_BY_NAME.get(equipment_key(name))
+    if item is None:
+        raise ValueError(f'invalid equipment: {name}')
+    return item
 
 
 class OffHandEquipment(EquipmentItem, enum.Enum):
@@ -31,7 +29,7 @@ class OffHandEquipment(EquipmentItem, enum.Enum):
     def by_class(cls: PlayerClass) -> Tuple[OffHandEquipment, ...]:
         return tuple(
             c for c in OffHandEquipment
-            if cls in c.value.classes
+            if cls in c.classes
         )
 
     BoneBracelet = (
@@ -62,7 +60,7 @@ class OffHandEquipment(EquipmentItem, enum.Enum):
         'Studded Shield',
         False,  # tradable
         51,  # sell value
-        (PlayerClass.Warrior),
+        (PlayerClass.Warrior,),
         Stats.from_sequence([0, 0, 0, 3, 0, 0, 1, 0]),
         EquipmentSlot.OffHand,
     )
@@ -70,7 +68,7 @@ class OffHandEquipment(EquipmentItem, enum.Enum):
         'Wooden Shield',
         True,  # tradable
         1,  # sell value
-        (PlayerClass.Warrior),
+        (PlayerClass.Warrior,),
         Stats.from_sequence([0, 0, 0, 2, 0, 0, 0, 0]),
         EquipmentSlot.OffHand,
     )
@@ -81,7 +79,7 @@ class MainHandEquipment(EquipmentItem, enum.Enum):
     def by_class(cls: PlayerClass) -> Tuple[MainHandEquipment, ...]:
         return tuple(
             c for c in MainHandEquipment
-            if cls in c.value.classes
+            if cls in c.classes
         )
 
     CrookedWand = (
@@ -104,7 +102,7 @@ class MainHandEquipment(EquipmentItem, enum.Enum):
         'Dimitri\'s Scythe',
         True,  # tradable
         367,  # sell value
-        (PlayerClass.Warrior),
+        (PlayerClass.Warrior,),
         Stats.from_sequence([0, 0, 8, 0, 0, 0, 0, 0]),
         EquipmentSlot.MainHand,
     )
@@ -112,7 +110,7 @@ class MainHandEquipment(EquipmentItem, enum.Enum):
         'Dimitri\'s Tooth',
         True,  # tradable
         121,  # sell value
-        (PlayerClass.Cleric),
+        (PlayerClass.Cleric,),
         Stats.from_sequence([0, 0, 3, 0, 1, 0, 0, 1]),
         EquipmentSlot.MainHand,
     )
@@ -128,7 +126,7 @@ class MainHandEquipment(EquipmentItem, enum.Enum):
         'Rusty Dagger',
         True,  # tradable
         121,  # sell value
-        (PlayerClass.Cleric),
+        (PlayerClass.Cleric,),
         Stats.from_sequence([0, 0, 3, 0, 1, 0, 0, 1]),
         EquipmentSlot.MainHand,
     )
@@ -136,7 +134,7 @@ class MainHandEquipment(EquipmentItem, enum.Enum):
         'The Tenderizer',
         True,  # tradable
         367,  # sell value
-        (PlayerClass.Warrior),
+        (PlayerClass.Warrior,),
         Stats.from_sequence([0, 0, 8, 0, 0, 0, 0, 0]),
         EquipmentSlot.MainHand,
     )
@@ -144,7 +142,7 @@ class MainHandEquipment(EquipmentItem, enum.Enum):
         'Training Sword',
         True,  # tradable
         45,  # sell value
-        (PlayerClass.Warrior),
+        (PlayerClass.Warrior,),
         Stats.from_sequence([0, 0, 5, 0, 0, 0, 0, 0]),
         EquipmentSlot.MainHand,
     )
@@ -171,14 +169,14 @@ class HeadEquipment(EquipmentItem, enum.Enum):
     def by_class(cls: PlayerClass) -> Tuple[HeadEquipment, ...]:
         return tuple(
             c for c in HeadEquipment
-            if cls in c.value.classes
+            if cls in c.classes
         )
 
     DentedHelm = (
         'Dented Helm',
         True,  # tradable
         147,  # sell value
-        (PlayerClass.Warrior),
+        (PlayerClass.Warrior,),
         Stats.from_sequence([0, 0, 0, 3, 0, 0, 0, 0]),
         EquipmentSlot.Head,
     )
@@ -202,7 +200,7 @@ class HeadEquipment(EquipmentItem, enum.Enum):
         'Mage Hat',
         True,  # tradable
         93,  # sell value
-        (PlayerClass.Wizard),
+        (PlayerClass.Wizard,),
         Stats.from_sequence([0, 0, 0, 1, 0, 1, 2, 0]),
         EquipmentSlot.Head,
     )
@@ -213,7 +211,7 @@ class BodyEquipment(EquipmentItem, enum.Enum):
     def by_class(cls: PlayerClass) -> Tuple[BodyEquipment, ...]:
         return tuple(
             c for c in BodyEquipment
-            if cls in c.value.classes
+            if cls in c.classes
         )
 
     DimitrisCloak = (
@@ -236,7 +234,7 @@ class BodyEquipment(EquipmentItem, enum.Enum):
         'Padded Garb',
         True,  # tradable
         18,  # sell value
-        (PlayerClass.Cleric),
+        (PlayerClass.Cleric,),
         Stats.from_sequence([0, 0, 0, 2, 0, 0, 1, 0]),
         EquipmentSlot.Body,
     )
@@ -265,3 +263,11 @@ GearType = Tuple[
     Optional[OffHandEquipment],
 ]
 
+
+# equipment_key of display names and aliases -> item. Enum names are
+# cleaned up display names, so they have the same keys.
+EQUIPMENT_BY_NAME: Dict[str, EquipmentItem] = {}
+for _equipment in (OffHandEquipment, MainHandEquipment, HeadEquipment, BodyEquipment):
+    for _item in _equipment:
+        EQUIPMENT_BY_NAME.setdefault(equipment_key(_item.itemname), _item)
+del _equipment, _item
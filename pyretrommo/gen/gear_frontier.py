@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# this file is auto-generated by gen_from_wiki.py
+from __future__ import annotations
+from typing import (
+    Dict,
+    Tuple,
+)
+from .equipment import (
+    BodyEquipment,
+    GearType,
+    HeadEquipment,
+    MainHandEquipment,
+    OffHandEquipment,
+)
+from .player_class import PlayerClass
+
+
+# pareto frontier gear sets, indexed by class then level
+GEAR_FRONTIER: Dict[PlayerClass, Tuple[Tuple[GearType, ...], ...]] = {
+    PlayerClass.Cleric: (
+        (  # level 0
+            (None, None, None, None),
+        ),
+        (  # level 1
+            (HeadEquipment.LeatherCap, BodyEquipment.PlainClothes, MainHandEquipment.OakenClub, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 2
+            (HeadEquipment.LeatherCap, BodyEquipment.PaddedGarb, MainHandEquipment.OakenClub, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 3
+            (HeadEquipment.LeatherCap, BodyEquipment.PaddedGarb, MainHandEquipment.OakenClub, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 4
+            (HeadEquipment.LeatherCap, BodyEquipment.PaddedGarb, MainHandEquipment.TrainingWand, OffHandEquipment.SimpleBracelet),
+            (HeadEquipment.LeatherCap, BodyEquipment.PaddedGarb, MainHandEquipment.OakenClub, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 5
+            (HeadEquipment.LeatherCap, BodyEquipment.PaddedGarb, MainHandEquipment.TrainingWand, OffHandEquipment.SimpleBracelet),
+            (HeadEquipment.LeatherCap, BodyEquipment.PaddedGarb, MainHandEquipment.OakenClub, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 6
+            (HeadEquipment.LeatherCap, BodyEquipment.PaddedGarb, MainHandEquipment.CrookedWand, OffHandEquipment.SimpleBracelet),
+            (HeadEquipment.LeatherCap, BodyEquipment.PaddedGarb, MainHandEquipment.RustyDagger, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 7
+            (HeadEquipment.LeatherCap, BodyEquipment.PaddedGarb, MainHandEquipment.CrookedWand, OffHandEquipment.SimpleBracelet),
+            (HeadEquipment.LeatherCap, BodyEquipment.PaddedGarb, MainHandEquipment.RustyDagger, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 8
+            (HeadEquipment.JaggedCrown, BodyEquipment.PaddedGarb, MainHandEquipment.CrookedWand, OffHandEquipment.BoneBracelet),
+            (HeadEquipment.JaggedCrown, BodyEquipment.PaddedGarb, MainHandEquipment.RustyDagger, OffHandEquipment.BoneBracelet),
+        ),
+        (  # level 9
+            (HeadEquipment.JaggedCrown, BodyEquipment.PaddedGarb, MainHandEquipment.CrookedWand, OffHandEquipment.BoneBracelet),
+            (HeadEquipment.JaggedCrown, BodyEquipment.PaddedGarb, MainHandEquipment.RustyDagger, OffHandEquipment.BoneBracelet),
+        ),
+        (  # level 10
+            (HeadEquipment.JaggedCrown, BodyEquipment.PaddedGarb, MainHandEquipment.CrookedWand, OffHandEquipment.BoneBracelet),
+            (HeadEquipment.JaggedCrown, BodyEquipment.PaddedGarb, MainHandEquipment.RustyDagger, OffHandEquipment.BoneBracelet),
+        ),
+    ),
+    PlayerClass.Warrior: (
+        (  # level 0
+            (None, None, None, None),
+        ),
+        (  # level 1
+            (HeadEquipment.LeatherCap, BodyEquipment.PlainClothes, MainHandEquipment.OakenClub, OffHandEquipment.WoodenShield),
+        ),
+        (  # level 2
+            (HeadEquipment.LeatherCap, BodyEquipment.LeatherArmor, MainHandEquipment.OakenClub, OffHandEquipment.WoodenShield),
+        ),
+        (  # level 3
+            (HeadEquipment.LeatherCap, BodyEquipment.LeatherArmor, MainHandEquipment.OakenClub, OffHandEquipment.WoodenShield),
+        ),
+        (  # level 4
+            (HeadEquipment.LeatherCap, BodyEquipment.LeatherArmor, MainHandEquipment.TrainingSword, OffHandEquipment.WoodenShield),
+        ),
+        (  # level 5
+            (HeadEquipment.LeatherCap, BodyEquipment.LeatherArmor, MainHandEquipment.TrainingSword, OffHandEquipment.WoodenShield),
+        ),
+        (  # level 6
+            (HeadEquipment.DentedHelm, BodyEquipment.LeatherArmor, MainHandEquipment.TrainingSword, OffHandEquipment.StuddedShield),
+        ),
+        (  # level 7
+            (HeadEquipment.DentedHelm, BodyEquipment.LeatherArmor, MainHandEquipment.TrainingSword, OffHandEquipment.StuddedShield),
+        ),
+        (  # level 8
+            (HeadEquipment.DentedHelm, BodyEquipment.LeatherArmor, MainHandEquipment.TheTenderizer, OffHandEquipment.StuddedShield),
+        ),
+        (  # level 9
+            (HeadEquipment.DentedHelm, BodyEquipment.LeatherArmor, MainHandEquipment.TheTenderizer, OffHandEquipment.StuddedShield),
+        ),
+        (  # level 10
+            (HeadEquipment.DentedHelm, BodyEquipment.LeatherArmor, MainHandEquipment.TheTenderizer, OffHandEquipment.StuddedShield),
+        ),
+    ),
+    PlayerClass.Wizard: (
+        (  # level 0
+            (None, None, None, None),
+        ),
+        (  # level 1
+            (HeadEquipment.LeatherCap, BodyEquipment.PlainClothes, MainHandEquipment.CypressStick, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 2
+            (HeadEquipment.LeatherCap, BodyEquipment.TatteredCloak, MainHandEquipment.CypressStick, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 3
+            (HeadEquipment.LeatherCap, BodyEquipment.TatteredCloak, MainHandEquipment.CypressStick, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 4
+            (HeadEquipment.LeatherCap, BodyEquipment.TatteredCloak, MainHandEquipment.TrainingWand, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 5
+            (HeadEquipment.LeatherCap, BodyEquipment.TatteredCloak, MainHandEquipment.TrainingWand, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 6
+            (HeadEquipment.MageHat, BodyEquipment.TatteredCloak, MainHandEquipment.CrookedWand, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 7
+            (HeadEquipment.MageHat, BodyEquipment.TatteredCloak, MainHandEquipment.CrookedWand, OffHandEquipment.SimpleBracelet),
+        ),
+        (  # level 8
+            (HeadEquipment.JaggedCrown, BodyEquipment.TatteredCloak, MainHandEquipment.CrookedWand, OffHandEquipment.BoneBracelet),
+            (HeadEquipment.MageHat, BodyEquipment.TatteredCloak, MainHandEquipment.CrookedWand, OffHandEquipment.BoneBracelet),
+        ),
+        (  # level 9
+            (HeadEquipment.JaggedCrown, BodyEquipment.TatteredCloak, MainHandEquipment.CrookedWand, OffHandEquipment.BoneBracelet),
+            (HeadEquipment.MageHat, BodyEquipment.TatteredCloak, MainHandEquipment.CrookedWand, OffHandEquipment.BoneBracelet),
+        ),
+        (  # level 10
+            (HeadEquipment.JaggedCrown, BodyEquipment.TatteredCloak, MainHandEquipment.CrookedWand, OffHandEquipment.BoneBracelet),
+            (HeadEquipment.MageHat, BodyEquipment.TatteredCloak, MainHandEquipment.CrookedWand, OffHandEquipment.BoneBracelet),
+        ),
+    ),
+}
@@ -132,7 +132,6 @@ def write_player_classes() -> None:
     f.write('    Tuple,\n')
     f.write(')\n')
     f.write('import enum\n')
-    f.write('import functools\n')
     f.write('\n')
     f.write('from ..item import EquipmentItem\n')
     f.write('from .ability import Ability\n')
@@ -145,24 +144,16 @@ def write_player_classes() -> None:
     f.write('\n')
 
     f.write(f'    @staticmethod\n')
-    f.write(f'    @functools.cache\n')
     f.write(f'    def get_abilities(cls: PlayerClass, level=10) -> Tuple[Ability, ...]:\n')
-    f.write(f'        from .class_info import CLASS_ABILITIES\n')
-    f.write(f'        abilities = CLASS_ABILITIES[cls]\n')
-    f.write(f'        return tuple(\n')
-    f.write(f'            a for a, lv in abilities.items()\n')
-    f.write(f'            if lv <= level\n')
-    f.write(f'        )\n')
+    f.write(f'        from .class_bits import ABILITIES_AT\n')
+    f.write(f'        by_level = ABILITIES_AT[cls]\n')
+    f.write(f'        return by_level[min(level, len(by_level) - 1)] if level >= 0 else ()\n')
     f.write('\n')
     f.write(f'    @staticmethod\n')
-    f.write(f'    @functools.cache\n')
     f.write(f'    def get_equipment(cls: PlayerClass, level=10) -> Tuple[\'EquipmentItem\', ...]:\n')
-    f.write(f'        from .class_info import CLASS_EQUIPMENT\n')
-    f.write(f'        equipment = CLASS_EQUIPMENT[cls]\n')
-    f.write(f'        return tuple(\n')
-    f.write(f'            e for e, lv in equipment.items()\n')
-    f.write(f'            if lv <= level\n')
-    f.write(f'        )\n')
+    f.write(f'        from .class_bits import EQUIPMENT_AT\n')
+    f.write(f'        by_level = EQUIPMENT_AT[cls]\n')
+    f.write(f'        return by_level[min(level, len(by_level) - 1)] if level >= 0 else ()\n')
     f.write('\n')
     f.close()
 
@@ -202,6 +193,80 @@ def write_class_info() -> None:
     f.close()
 
 
+def write_class_bits() -> None:
+    classes = gen_player_classes()
+    abilities = gen_player_class_abilities()
+    equipments = gen_player_class_equipment()
+    ability_order = gen_abilities()
+    equipment_order = list(gen_equipment())
+
+    f = start_python_file('class_bits.py')
+    f.write('from typing import (\n')
+    f.write('    Dict,\n')
+    f.write('    Sequence,\n')
+    f.write('    Tuple,\n')
+    f.write('    TypeVar,\n')
+    f.write(')\n')
+    f.write('from ..item import EquipmentItem\n')
+    f.write('from .ability import Ability\n')
+    f.write('from .equipment import find_equipment\n')
+    f.write('from .player_class import PlayerClass\n')
+    f.write('\n\n')
+    f.write('# bit i of an ability mask is ABILITY_ORDER[i]\n')
+    f.write('ABILITY_ORDER: Tuple[Ability, ...] = (\n')
+    for ability in ability_order:
+        f.write(f'    Ability.{cleanup_name(ability)},\n')
+    f.write(')\n\n')
+    f.write('# bit i of an equipment mask is EQUIPMENT_ORDER[i]\n')
+    f.write('EQUIPMENT_ORDER: Tuple[EquipmentItem, ...] = (\n')
+    for equipment in equipment_order:
+        f.write(f"    find_equipment('{cleanup_name(equipment, True)}'),\n")
+    f.write(')\n\n\n')
+
+    def key(name: str) -> str:
+        # same normalization as equipment.equipment_key
+        return ''.join(c for c in name.lower() if c.isalnum())
+
+    def write_bits(name: str, order: List[str], by_class: Dict[str, Dict[str, int]]):
+        bit = {key(n): i for i, n in enumerate(order)}
+        f.write(f'{name}: Dict[PlayerClass, Tuple[int, ...]] = {{\n')
+        for pc in classes:
+            required = by_class[pc]
+            max_level = max(
+                len(gen_player_stats(pc)) - 1,
+                *required.values(),
+            )
+            masks = []
+            for level in range(max_level + 1):
+                mask = 0
+                for n, lv in required.items():
+                    if lv <= level:
+                        mask |= 1 << bit[key(n)]
+                masks.append(f'{mask:#x}')
+            f.write(f'    PlayerClass.{pc}: ({", ".join(masks)}),\n')
+        f.write('}\n\n')
+
+    f.write('# everything a class has at each level, indexed by level\n')
+    write_bits('ABILITY_BITS', ability_order, abilities)
+    write_bits('EQUIPMENT_BITS', equipment_order, equipments)
+    f.write('\n')
+    f.write("T = TypeVar('T')\n")
+    f.write('\n\n')
+    f.write('def members(order: Sequence[T], mask: int) -> Tuple[T, ...]:\n')
+    f.write('    return tuple(x for i, x in enumerate(order) if mask >> i & 1)\n')
+    f.write('\n\n')
+    f.write('# the masks decoded, for PlayerClass.get_abilities and get_equipment\n')
+    f.write('ABILITIES_AT: Dict[PlayerClass, Tuple[Tuple[Ability, ...], ...]] = {\n')
+    f.write('    pc: tuple(members(ABILITY_ORDER, m) for m in masks)\n')
+    f.write('    for pc, masks in ABILITY_BITS.items()\n')
+    f.write('}\n')
+    f.write('EQUIPMENT_AT: Dict[PlayerClass, Tuple[Tuple[EquipmentItem, ...], ...]] = {\n')
+    f.write('    pc: tuple(members(EQUIPMENT_ORDER, m) for m in masks)\n')
+    f.write('    for pc, masks in EQUIPMENT_BITS.items()\n')
+    f.write('}\n')
+    f.close()
+
+
 #
 # PlayerStats
 #
@@ -457,7 +522,7 @@ def write_equipment() -> None:
         by_slot[slot].append(item)
 
     f = start_python_file('equipment.py')
-    f.write('from typing import Optional, Tuple\n')
+    f.write('from typing import Dict, Optional, Tuple\n')
     f.write('import enum\n')
     f.write('import functools\n')
     f.write('\n')
@@ -466,17 +531,14 @@ def write_equipment() -> None:
     f.write('from .equipment_slot import EquipmentSlot\n')
     f.write('from .player_class import PlayerClass\n')
     f.write('\n\n')
+    f.write('def equipment_key(name: str) -> str:\n')
+    f.write("    return ''.join(c for c in name.lower() if c.isalnum())\n")
+    f.write('\n\n')
     f.write('def find_equipment(name: str) -> EquipmentItem:\n')
-    f.write("    name = name.replace(\"'\", \"\\'\").title().replace(' ', '')\n")
-    f.write('    try: return OffHandEquipment[name]\n')
-    f.write('    except KeyError: pass\n')
-    f.write('    try: return MainHandEquipment[name]\n')
-    f.write('    except KeyError: pass\n')
-    f.write('    try: return HeadEquipment[name]\n')
-    f.write('    except KeyError: pass\n')
-    f.write('    try: return BodyEquipment[name]\n')
-    f.write('    except KeyError: pass\n')
-    f.write("    raise ValueError(f\'invalid equipment: {name}\')\n")
+    f.write('    item = EQUIPMENT_BY_NAME.get(equipment_key(name))\n')
+    f.write('    if item is None:\n')
+    f.write("        raise ValueError(f'invalid equipment: {name}')\n")
+    f.write('    return item\n')
     f.write('\n\n')
 
     for slot_name in by_slot:
@@ -488,7 +550,7 @@ def write_equipment() -> None:
         f.write(f'    def by_class(cls: PlayerClass) -> Tuple[{classname}, ...]:\n')
         f.write(f'        return tuple(\n')
         f.write(f'            c for c in {classname}\n')
-        f.write(f'            if cls in c.value.classes\n')
+        f.write(f'            if cls in c.classes\n')
         f.write(f'        )\n')
         f.write('\n')
 
@@ -502,6 +564,8 @@ def write_equipment() -> None:
             slot = cleanup_name(item['slot'])
 
             classes_str = ', '.join(f'PlayerClass.{c}' for c in classes)
+            if len(classes) == 1:
+                classes_str += ','
 
             f.write(f'    {item_name} = (\n')
             f.write(f"        '{name}',\n")
@@ -519,7 +583,60 @@ def write_equipment() -> None:
     f.write('    Optional[MainHandEquipment],\n')
     f.write('    Optional[OffHandEquipment],\n')
     f.write(']\n')
-    f.write('\n')
+    f.write('\n\n')
+    f.write('# equipment_key of display names and aliases -> item. Enum names are\n')
+    f.write('# cleaned up display names, so they have the same keys.\n')
+    f.write('EQUIPMENT_BY_NAME: Dict[str, EquipmentItem] = {}\n')
+    f.write('for _equipment in (OffHandEquipment, MainHandEquipment, HeadEquipment, BodyEquipment):\n')
+    f.write('    for _item in _equipment:\n')
+    f.write('        EQUIPMENT_BY_NAME.setdefault(equipment_key(_item.itemname), _item)\n')
+    f.write('del _equipment, _item\n')
+    f.close()
+
+
+#
+# GearFrontier
+#
+
+
+def write_gear_frontier() -> None:
+    # computed from the files written above, so import them fresh
+    import sys
+    sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+    from pyretrommo.frontier import all_frontiers
+
+    def gear_str(item) -> str:
+        if item is None:
+            return 'None'
+        return f'{type(item).__name__}.{item.name}'
+
+    frontiers = all_frontiers()
+    f = start_python_file('gear_frontier.py')
+    f.write('from typing import (\n')
+    f.write('    Dict,\n')
+    f.write('    Tuple,\n')
+    f.write(')\n')
+    f.write('from .equipment import (\n')
+    f.write('    BodyEquipment,\n')
+    f.write('    GearType,\n')
+    f.write('    HeadEquipment,\n')
+    f.write('    MainHandEquipment,\n')
+    f.write('    OffHandEquipment,\n')
+    f.write(')\n')
+    f.write('from .player_class import PlayerClass\n')
+    f.write('\n\n')
+    f.write('# pareto frontier gear sets, indexed by class then level\n')
+    f.write('GEAR_FRONTIER: Dict[PlayerClass, Tuple[Tuple[GearType, ...], ...]] = {\n')
+    for pc, levels in frontiers.items():
+        f.write(f'    PlayerClass.{pc.name}: (\n')
+        for level, front in enumerate(levels):
+            f.write(f'        (  # level {level}\n')
+            for gear in front:
+                items = ', '.join(gear_str(item) for item in gear)
+                f.write(f'            ({items}),\n')
+            f.write('        ),\n')
+        f.write('    ),\n')
+    f.write('}\n')
     f.close()
 
 
@@ -539,6 +656,8 @@ def write_all():
     write_equipment_slots()
     write_equipment()
     write_class_info()
+    write_class_bits()
+    write_gear_frontier()
 
 
 if __name__ == '__main__':
@@ -6,7 +6,6 @@ from typing import (
     Tuple,
 )
 import enum
-import functools
 
 from ..item import EquipmentItem
 from .ability import Ability
@@ -19,22 +18,14 @@ class PlayerClass(enum.Enum):
     Wizard = 'wizard'
 
     @staticmethod
-    @functools.cache
     def get_abilities(cls: PlayerClass, level=10) -> Tuple[Ability, ...]:
-        from .class_info import CLASS_ABILITIES
-        abilities = CLASS_ABILITIES[cls]
-        return tuple(
-            a for a, lv in abilities.items()
-            if lv <= level
-        )
+        from .class_bits import ABILITIES_AT
+        by_level = ABILITIES_AT[cls]
+        return by_level[min(level, len(by_level) - 1)] if level >= 0 else ()
 
     @staticmethod
-    @functools.cache
     def get_equipment(cls: PlayerClass, level=10) -> Tuple['EquipmentItem', ...]:
-        from .class_info import CLASS_EQUIPMENT
-        equipment = CLASS_EQUIPMENT[cls]
-        return tuple(
-            e for e, lv in equipment.items()
-            if lv <= level
-        )
+        from .class_bits import EQUIPMENT_AT
+        by_level = EQUIPMENT_AT[cls]
+        return by_level[min(level, len(by_level) - 1)] if level >= 0 else ()
 
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+import heapq
+
+from .gen.equipment import GearType
+from .gen.player_class import PlayerClass
+from .item import EquipmentItem
+from .player import (
+    GEAR_INDEX,
+    GEAR_SLOTS,
+    as_gear,
+    build_stats,
+)
+from .stats import (
+    Stats,
+    ZERO_STATS,
+)
+
+
+# Best-in-slot search. The objective is a weighted sum of the total stats,
+# optionally with minimum totals for some stats:
+#
+#   best_gear(PlayerClass.Warrior, 10, {'strength': 2, 'defense': 1}, k=3,
+#             minimums={'hp': 60})
+#
+# Per slot, items dominated by k or more other items can't be part of a top-k
+# build and are dropped before searching. The search then fills slots
+# depth-first, best items first, and abandons a branch as soon as the best
+# possible completion can't beat the current k-th result or can't meet the
+# minimums.
+
+
+STAT_NAMES: Tuple[str, ...] = Stats._fields
+
+Weights = Union[Stats, Sequence[float], Mapping[str, float]]
+
+
+class GearResult(NamedTuple):
+    score: float
+    gear: GearType
+    stats: Stats  # totals, including base stats and boosts
+
+
+class _Candidate(NamedTuple):
+    score: float
+    stats: Stats
+    item: Optional[EquipmentItem]
+
+
+def stat_weights(weights: Weights) -> Tuple[float, ...]:
+    """stat weights as an 8-tuple, a mapping may name only some stats"""
+    if isinstance(weights, Mapping):
+        unknown = set(weights) - set(STAT_NAMES)
+        if unknown:
+            raise ValueError(f'unknown stats: {sorted(unknown)}')
+        return tuple(float(weights.get(name, 0.0)) for name in STAT_NAMES)
+    vector = tuple(float(w) for w in weights)
+    if len(vector) != 8:
+        raise ValueError(f'invalid stat weights: {weights}')
+    return vector
+
+
+def _score(weights: Sequence[float], stats: Stats) -> float:
+    return sum(w * s for w, s in zip(weights, stats))
+
+
+def _directions(
+    weights: Sequence[float],
+    minimums: Sequence[Optional[int]],
+) -> Tuple[Optional[int], ...]:
+    """
+    per stat: 1 if more is better, -1 if less is better, 0 if it doesn't
+    matter, None if it pulls both ways and must match exactly
+    """
+    directions: List[Optional[int]] = []
+    for w, m in zip(weights, minimums):
+        if w < 0:
+            directions.append(None if m is not None else -1)
+        elif w > 0 or m is not None:
+            directions.append(1)
+        else:
+            directions.append(0)
+    return tuple(directions)
+
+
+def _dominates(
+    a: Stats,
+    b: Stats,
+    directions: Sequence[Optional[int]],
+) -> bool:
+    """a is at least as good as b in every stat that matters"""
+    for x, y, d in zip(a, b, directions):
+        if d == 1:
+            if x < y:
+                return False
+        elif d == -1:
+            if x > y:
+                return False
+        elif d is None:
+            if x != y:
+                return False
+    return True
+
+
+def prune_dominated(
+    candidates: Sequence[_Candidate],
+    directions: Sequence[Optional[int]],
+    k: int,
+) -> List[_Candidate]:
+    """
+    drop candidates dominated by at least k others. Ties are broken by
+    position so that of two equivalent candidates only the later is dominated.
+    """
+    keys = [
+        tuple(s for s, d in zip(c.stats, directions) if d != 0)
+        for c in candidates
+    ]
+    kept = []
+    for i, c in enumerate(candidates):
+        dominated_by = 0
+        for j, o in enumerate(candidates):
+            if i == j or not _dominates(o.stats, c.stats, directions):
+                continue
+            if keys[i] == keys[j] and j > i:
+                continue
+            dominated_by += 1
+            if dominated_by >= k:
+                break
+        if dominated_by < k:
+            kept.append(c)
+    return kept
+
+
+def slot_candidates(
+    items: Iterable[EquipmentItem],
+) -> List[List[Optional[EquipmentItem]]]:
+    """items grouped by GearType position, each slot may also be empty"""
+    slots: List[List[Optional[EquipmentItem]]] = [[None] for _ in GEAR_SLOTS]
+    for item in items:
+        slots[GEAR_INDEX[item.slot]].append(item)
+    return slots
+
+
+def best_gear(
+    player_class: PlayerClass,
+    level: int,
+    weights: Weights,
+    k: int = 1,
+    *,
+    minimums: Optional[Mapping[str, int]] = None,
+    boosts: Stats = ZERO_STATS,
+    items: Optional[Iterable[EquipmentItem]] = None,
+) -> List[GearResult]:
+    """
+    the k best gear sets for a class and level, best first. items defaults to
+    everything the class can wear at that level.
+    """
+    if k <= 0:
+        return []
+    w = stat_weights(weights)
+    minimums = minimums or {}
+    unknown = set(minimums) - set(STAT_NAMES)
+    if unknown:
+        raise ValueError(f'unknown stats: {sorted(unknown)}')
+    mins = tuple(minimums.get(name) for name in STAT_NAMES)
+    directions = _directions(w, mins)
+
+    if items is None:
+        items = PlayerClass.get_equipment(player_class, level)
+    start = build_stats(player_class, level, as_gear((None,) * 4), boosts)
+
+    slots: List[List[_Candidate]] = []
+    for options in slot_candidates(items):
+        candidates = [
+            _Candidate(
+                _score(w, ZERO_STATS if item is None else item.stats),
+                ZERO_STATS if item is None else item.stats,
+                item,
+            )
+            for item in options
+        ]
+        candidates = prune_dominated(candidates, directions, k)
+        candidates.sort(key=lambda c: c.score, reverse=True)
+        slots.append(candidates)
+
+    # best possible score and stats from slot i onwards
+    n = len(slots)
+    best_score = [0.0] * (n + 1)
+    best_stats = [[0] * 8 for _ in range(n + 1)]
+    for i in range(n - 1, -1, -1):
+        best_score[i] = best_score[i + 1] + slots[i][0].score
+        for s in range(8):
+            best_stats[i][s] = best_stats[i + 1][s] + max(
+                c.stats[s] for c in slots[i]
+            )
+    required = [
+        (s, m - start[s]) for s, m in enumerate(mins) if m is not None
+    ]
+
+    # min-heap of (score, order, gear), order keeps ties stable
+    results: List[Tuple[float, int, Tuple[Optional[EquipmentItem], ...]]] = []
+    order = 0
+    gear: List[Optional[EquipmentItem]] = [None] * n
+    totals = [0] * 8
+    base_score = _score(w, start)
+
+    def search(i: int, score: float) -> None:
+        nonlocal order
+        if i == n:
+            if any(totals[s] < need for s, need in required):
+                return
+            entry = (base_score + score, -order, tuple(gear))
+            order += 1
+            if len(results) < k:
+                heapq.heappush(results, entry)
+            else:
+                heapq.heappushpop(results, entry)
+            return
+        rest = best_score[i + 1]
+        for c in slots[i]:
+            if (
+                len(results) == k and
+                base_score + score + c.score + rest <= results[0][0]
+            ):
+                # candidates are sorted, the rest are no better
+                break
+            for s in range(8):
+                totals[s] += c.stats[s]
+            if all(
+                totals[s] + best_stats[i + 1][s] >= need
+                for s, need in required
+            ):
+                gear[i] = c.item
+                search(i + 1, score + c.score)
+            for s in range(8):
+                totals[s] -= c.stats[s]
+        gear[i] = None
+
+    search(0, 0.0)
+    results.sort(reverse=True)
+    gear_sets = [(score, as_gear(found)) for score, _, found in results]
+    return [
+        GearResult(score, gear, build_stats(player_class, level, gear, boosts))
+        for score, gear in gear_sets
+    ]
+
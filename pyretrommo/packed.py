@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+import mmap
+import os
+import struct
+import weakref
+import zlib
+
+from .gen.equipment import (
+    BodyEquipment,
+    GearType,
+    HeadEquipment,
+    MainHandEquipment,
+    OffHandEquipment,
+)
+from .gen.player_class import PlayerClass
+from .item import EquipmentItem
+from .player import (
+    Player,
+    as_gear,
+)
+from .stats import Stats
+
+
+# Fixed-width binary player records, for storing many snapshots compactly.
+# A record is 42 bytes, little endian:
+#
+#   8 x int16   stats (hp, mp, strength, ... luck)
+#   uint8       class id
+#   uint8       level
+#   4 x uint16  gear ids (head, body, main hand, off hand)
+#   8 x int16   boosts
+#
+# Class and gear ids are 1 + the member's position in its pyretrommo.gen enum,
+# 0 means no gear. Ids follow the generated enums, so files carry a
+# fingerprint of the catalog they were written with, and PackedFile refuses
+# one written against a different catalog (re-generated enums can renumber
+# items). Usernames are not stored, keep them alongside the records.
+
+
+RECORD = struct.Struct('<8h2B4H8h')
+_STATS = struct.Struct('<8h')
+_INFO = struct.Struct('<2B4H')
+_INFO_OFFSET = _STATS.size
+_BOOSTS_OFFSET = _INFO_OFFSET + _INFO.size
+
+# file header: magic, format version, record size, catalog fingerprint
+HEADER = struct.Struct('<4sHHI')
+MAGIC = b'PRMP'
+VERSION = 2
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+_RecordIterator = Generator[Tuple[int, ...], None, None]
+
+CLASSES: Tuple[Optional[PlayerClass], ...] = (None, *PlayerClass)
+CLASS_IDS: Dict[PlayerClass, int] = {
+    c: i for i, c in enumerate(CLASSES) if c is not None
+}
+
+# indexed like GearType
+GEAR: Tuple[Tuple[Optional[EquipmentItem], ...], ...] = tuple(
+    (None, *equipment)
+    for equipment in (
+        HeadEquipment,
+        BodyEquipment,
+        MainHandEquipment,
+        OffHandEquipment,
+    )
+)
+GEAR_IDS: Tuple[Dict[EquipmentItem, int], ...] = tuple(
+    {item: i for i, item in enumerate(items) if item is not None}
+    for items in GEAR
+)
+
+# crc32 of every class and item name in id order
+CATALOG = zlib.crc32('\n'.join(
+    [c.name if c is not None else '' for c in CLASSES] +
+    [
+        item.itemname if item is not None else ''
+        for items in GEAR
+        for item in items
+    ]
+).encode())
+
+
+def gear_from_ids(ids: Iterable[int]) -> GearType:
+    """the GearType for four gear ids, 0 for an empty slot"""
+    return as_gear(items[i] for items, i in zip(GEAR, ids))
+
+
+def pack_into(buffer: Any, offset: int, player: Player) -> None:
+    RECORD.pack_into(
+        buffer,
+        offset,
+        *player.stats,
+        CLASS_IDS[player.player_class],
+        player.level,
+        *(
+            0 if item is None else ids[item]
+            for ids, item in zip(GEAR_IDS, player.gear)
+        ),
+        *player.boosts,
+    )
+
+
+def pack_player(player: Player) -> bytes:
+    buffer = bytearray(RECORD.size)
+    pack_into(buffer, 0, player)
+    return bytes(buffer)
+
+
+def pack_players(players: Iterable[Player]) -> bytes:
+    players = list(players)
+    buffer = bytearray(RECORD.size * len(players))
+    for i, player in enumerate(players):
+        pack_into(buffer, i * RECORD.size, player)
+    return bytes(buffer)
+
+
+def unpack_player(
+    buffer: Buffer,
+    offset: int = 0,
+    username: str = '',
+) -> Player:
+    return PackedPlayer(buffer, offset).to_player(username)
+
+
+def iter_unpack(buffer: Buffer) -> Iterator[Tuple[int, ...]]:
+    """raw 26-int tuples for each record, in bulk"""
+    return RECORD.iter_unpack(memoryview(buffer))
+
+
+def unpack_stats(buffer: Buffer) -> List[Stats]:
+    """the stats of every record"""
+    make = Stats._make
+    return [make(record[:8]) for record in iter_unpack(buffer)]
+
+
+class PackedPlayer:
+    """
+    view of one record in a buffer. Fields are decoded when accessed, nothing
+    is copied until then.
+    """
+
+    __slots__ = ('_buffer', '_offset')
+
+    def __init__(self, buffer: Buffer, offset: int = 0) -> None:
+        self._buffer = buffer
+        self._offset = offset
+
+    def __repr__(self) -> str:
+        return (
+            f'<PackedPlayer: {self.player_class.name} '
+            f'level {self.level} at {self._offset}>'
+        )
+
+    @property
+    def stats(self) -> Stats:
+        return Stats._make(_STATS.unpack_from(self._buffer, self._offset))
+
+    @property
+    def class_id(self) -> int:
+        return self._buffer[self._offset + _INFO_OFFSET]
+
+    @property
+    def player_class(self) -> PlayerClass:
+        player_class = CLASSES[self.class_id]
+        if player_class is None:
+            raise ValueError(f'invalid class id at {self._offset}')
+        return player_class
+
+    @property
+    def level(self) -> int:
+        return self._buffer[self._offset + _INFO_OFFSET + 1]
+
+    @property
+    def gear_ids(self) -> Tuple[int, int, int, int]:
+        _, _, head, body, main_hand, off_hand = _INFO.unpack_from(
+            self._buffer,
+            self._offset + _INFO_OFFSET,
+        )
+        return head, body, main_hand, off_hand
+
+    @property
+    def gear(self) -> GearType:
+        return gear_from_ids(self.gear_ids)
+
+    @property
+    def boosts(self) -> Stats:
+        return Stats._make(
+            _STATS.unpack_from(self._buffer, self._offset + _BOOSTS_OFFSET)
+        )
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._buffer[self._offset:self._offset + RECORD.size])
+
+    def to_player(self, username: str = '') -> Player:
+        return Player(
+            username,
+            self.level,
+            self.player_class,
+            self.gear,
+            self.boosts,
+        )
+
+
+def write_players(
+    f: Union[str, os.PathLike, BinaryIO],
+    players: Iterable[Player],
+) -> int:
+    """write a header and the packed players, returns the record count"""
+    if isinstance(f, (str, os.PathLike)):
+        with open(f, 'wb') as fp:
+            return write_players(fp, players)
+    f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, CATALOG))
+    count = 0
+    buffer = bytearray(RECORD.size)
+    for player in players:
+        pack_into(buffer, 0, player)
+        f.write(buffer)
+        count += 1
+    return count
+
+
+class PackedFile:
+    """
+    read-only, memory mapped file written by write_players. Indexing and
+    iterating yield PackedPlayer views into the mapping, which stop working
+    once the file is closed.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self._file = open(path, 'rb')
+        self._iterators: weakref.WeakSet[_RecordIterator]
+        self._iterators = weakref.WeakSet()
+        header = self._file.read(HEADER.size)
+        if (
+            len(header) != HEADER.size or
+            HEADER.unpack(header)[:3] != (MAGIC, VERSION, RECORD.size)
+        ):
+            self._file.close()
+            raise ValueError(f'{path} is not a packed player file')
+        if HEADER.unpack(header)[3] != CATALOG:
+            self._file.close()
+            raise ValueError(
+                f'{path} was written with a different equipment catalog'
+            )
+        self._mmap = mmap.mmap(
+            self._file.fileno(),
+            0,
+            access=mmap.ACCESS_READ,
+        )
+        self.records = memoryview(self._mmap)[HEADER.size:]
+        if len(self.records) % RECORD.size:
+            self.close()
+            raise ValueError(f'{path} is truncated')
+
+    def __enter__(self) -> PackedFile:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.records) // RECORD.size
+
+    def __getitem__(self, i: int) -> PackedPlayer:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('record index out of range')
+        return PackedPlayer(self.records, i * RECORD.size)
+
+    def __iter__(self) -> Iterator[PackedPlayer]:
+        records = self.records
+        for offset in range(0, len(records), RECORD.size):
+            yield PackedPlayer(records, offset)
+
+    def iter_unpack(self) -> Iterator[Tuple[int, ...]]:
+        """like iter_unpack(), ended by close() if still running"""
+        iterator = self._iter_unpack()
+        self._iterators.add(iterator)
+        return iterator
+
+    def _iter_unpack(self) -> _RecordIterator:
+        view = self.records[:]
+        try:
+            yield from RECORD.iter_unpack(view)
+        finally:
+            view.release()
+
+    def close(self) -> None:
+        # the mmap can't close while an iterator still holds a view of it
+        for iterator in list(self._iterators):
+            iterator.close()
+        records = getattr(self, 'records', None)
+        if records is not None:
+            records.release()
+            self.records = memoryview(b'')
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
@@ -1,16 +1,90 @@
 #!/usr/bin/env python3
+from __future__ import annotations
 from typing import (
+    Iterable,
+    List,
+    Optional,
     Tuple,
 )
+import functools
 
 from .character import Character
+from .gen.equipment import (
+    BodyEquipment,
+    GearType,
+    HeadEquipment,
+    MainHandEquipment,
+    OffHandEquipment,
+)
+from .gen.equipment_slot import EquipmentSlot
 from .gen.player_class import PlayerClass
 from .gen.player_stats import STATS_BY_PLAYER_CLASS
-from .gen.equipment import GearType
-from .stats import Stats
+from .item import EquipmentItem
+from .stats import (
+    Stats,
+    StatsAccumulator,
+)
+
+
+# the slot held by each position of a GearType
+GEAR_SLOTS: Tuple[EquipmentSlot, ...] = (
+    EquipmentSlot.Head,
+    EquipmentSlot.Body,
+    EquipmentSlot.MainHand,
+    EquipmentSlot.OffHand,
+)
+GEAR_INDEX = {slot: i for i, slot in enumerate(GEAR_SLOTS)}
+
+
+def as_gear(items: Iterable[Optional[EquipmentItem]]) -> GearType:
+    """a GearType from four items (or None) in GEAR_SLOTS order"""
+    head, body, main_hand, off_hand = items
+    if not (
+        (head is None or isinstance(head, HeadEquipment)) and
+        (body is None or isinstance(body, BodyEquipment)) and
+        (main_hand is None or isinstance(main_hand, MainHandEquipment)) and
+        (off_hand is None or isinstance(off_hand, OffHandEquipment))
+    ):
+        raise ValueError(
+            f'gear in the wrong slots: {(head, body, main_hand, off_hand)}'
+        )
+    return (head, body, main_hand, off_hand)
+
+
+def replace_gear(
+    gear: GearType,
+    slot: EquipmentSlot,
+    item: Optional[EquipmentItem],
+) -> GearType:
+    """gear with slot holding item instead"""
+    items: List[Optional[EquipmentItem]] = list(gear)
+    items[GEAR_INDEX[slot]] = item
+    return as_gear(items)
+
+STATS_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=STATS_CACHE_SIZE)
+def build_stats(
+    player_class: PlayerClass,
+    level: int,
+    gear: GearType,
+    boosts: Stats,
+) -> Stats:
+    """total stats of a build, identical builds share the result"""
+    stats = StatsAccumulator(STATS_BY_PLAYER_CLASS[player_class][level])
+    for item in gear:
+        if item is not None:
+            stats += item.stats
+    stats += boosts
+    return stats.stats()
 
 
 class Player(Character):
+    """
+    stats are kept up to date as level, gear and boosts change, only the
+    changed part is subtracted and re-added.
+    """
 
     def __init__(
         self,
@@ -20,18 +94,85 @@ class Player(Character):
         gear: GearType,
         boosts: Stats,
     ) -> None:
-        self.level = level
-        self.player_class = player_class
-        self.gear = gear
-        self.boosts = boosts
+        self._level = level
+        self._player_class = player_class
+        self._gear = as_gear(gear)
+        self._boosts = boosts
 
         stats = self.calculate_stats()
         abilities = PlayerClass.get_abilities(player_class, level)
         super().__init__(username, stats, abilities)
 
     def calculate_stats(self) -> Stats:
-        stats = Stats(*STATS_BY_PLAYER_CLASS[self.player_class][self.level])
-        for gear in self.gear:
-            stats += gear
-        stats += self.boosts
-        return stats
+        return build_stats(
+            self._player_class,
+            self._level,
+            self._gear,
+            self._boosts,
+        )
+
+    @property
+    def player_class(self) -> PlayerClass:
+        return self._player_class
+
+    @player_class.setter
+    def player_class(self, player_class: PlayerClass) -> None:
+        self._player_class = player_class
+        self.stats = self.calculate_stats()
+        self.abilities = PlayerClass.get_abilities(player_class, self._level)
+
+    @property
+    def level(self) -> int:
+        return self._level
+
+    @level.setter
+    def level(self, level: int) -> None:
+        base = STATS_BY_PLAYER_CLASS[self._player_class]
+        self.stats = self.stats - base[self._level] + base[level]
+        self._level = level
+        self.abilities = PlayerClass.get_abilities(self._player_class, level)
+
+    @property
+    def boosts(self) -> Stats:
+        return self._boosts
+
+    @boosts.setter
+    def boosts(self, boosts: Stats) -> None:
+        self.stats = self.stats - self._boosts + boosts
+        self._boosts = boosts
+
+    @property
+    def gear(self) -> GearType:
+        return self._gear
+
+    @gear.setter
+    def gear(self, gear: GearType) -> None:
+        gear = as_gear(gear)
+        stats = StatsAccumulator(self.stats)
+        for old, new in zip(self._gear, gear):
+            if old is not new:
+                if old is not None:
+                    stats -= old.stats
+                if new is not None:
+                    stats += new.stats
+        self.stats = stats.stats()
+        self._gear = gear
+
+    def equip(self, item: EquipmentItem) -> Optional[EquipmentItem]:
+        """put item in its slot, returns what was there"""
+        old = self._gear[GEAR_INDEX[item.slot]]
+        self.gear = replace_gear(self._gear, item.slot, item)
+        return old
+
+    def unequip(self, slot: EquipmentSlot) -> Optional[EquipmentItem]:
+        """empty a slot, returns what was there"""
+        old = self._gear[GEAR_INDEX[slot]]
+        self.gear = replace_gear(self._gear, slot, None)
+        return old
+
+    def stats_with(self, item: EquipmentItem) -> Stats:
+        """stats if item replaced the one in its slot, without equipping it"""
+        old = self._gear[GEAR_INDEX[item.slot]]
+        if old is None:
+            return self.stats + item.stats
+        return self.stats - old.stats + item.stats
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+import concurrent.futures
+import os
+
+from .gen.player_class import PlayerClass
+from .gen.player_stats import STATS_BY_PLAYER_CLASS
+from .item import EquipmentItem
+from .optimize import (
+    GearResult,
+    Weights,
+    best_gear,
+    stat_weights,
+)
+from .packed import (
+    CLASS_IDS,
+    CLASSES,
+    GEAR,
+    GEAR_IDS,
+    gear_from_ids,
+)
+from .player import GEAR_INDEX
+from .stats import Stats
+
+
+# Batch gear search over a process pool:
+#
+#   jobs = [SearchJob(c, level, profile) for c in PlayerClass ...]
+#   for job, results in zip(jobs, search(jobs)):
+#       ...
+#
+# Each worker gets the equipment table for every (class, level) once, from
+# the pool initializer. Jobs and results cross the process boundary as small
+# tuples of ids and numbers (the packed record ids), never as enum members.
+
+
+class SearchJob(NamedTuple):
+    player_class: PlayerClass
+    level: int
+    weights: Weights
+    k: int = 1
+    minimums: Optional[Mapping[str, int]] = None
+
+
+# (class id, level) -> (gear position, gear id) of each wearable item
+EquipmentTable = Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]
+
+_Task = Tuple[int, int, Tuple[float, ...], int, Optional[Dict[str, int]]]
+_Result = List[Tuple[float, Tuple[int, ...], Tuple[int, ...]]]
+
+# set in each worker by _init_worker
+_ITEMS: Dict[Tuple[int, int], Tuple[EquipmentItem, ...]] = {}
+
+
+def equipment_table() -> EquipmentTable:
+    table: EquipmentTable = {}
+    for player_class in PlayerClass:
+        for level in range(len(STATS_BY_PLAYER_CLASS[player_class])):
+            items = PlayerClass.get_equipment(player_class, level)
+            table[CLASS_IDS[player_class], level] = tuple(
+                (GEAR_INDEX[item.slot], GEAR_IDS[GEAR_INDEX[item.slot]][item])
+                for item in items
+            )
+    return table
+
+
+def _init_worker(table: EquipmentTable) -> None:
+    _ITEMS.clear()
+    for key, ids in table.items():
+        # the table never holds id 0 (no gear)
+        items = (GEAR[i][gear_id] for i, gear_id in ids)
+        _ITEMS[key] = tuple(item for item in items if item is not None)
+
+
+def _run(task: _Task) -> _Result:
+    class_id, level, weights, k, minimums = task
+    player_class = CLASSES[class_id]
+    assert player_class is not None
+    return [
+        (
+            result.score,
+            tuple(
+                0 if item is None else ids[item]
+                for ids, item in zip(GEAR_IDS, result.gear)
+            ),
+            tuple(result.stats),
+        )
+        for result in best_gear(
+            player_class,
+            level,
+            weights,
+            k,
+            minimums=minimums,
+            items=_ITEMS[class_id, level],
+        )
+    ]
+
+
+def _task(job: SearchJob) -> _Task:
+    return (
+        CLASS_IDS[job.player_class],
+        job.level,
+        stat_weights(job.weights),
+        job.k,
+        None if job.minimums is None else dict(job.minimums),
+    )
+
+
+def _results(result: _Result) -> List[GearResult]:
+    return [
+        GearResult(
+            score,
+            gear_from_ids(ids),
+            Stats._make(stats),
+        )
+        for score, ids, stats in result
+    ]
+
+
+def search(
+    jobs: Iterable[SearchJob],
+    *,
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> Iterator[List[GearResult]]:
+    """
+    best_gear for each job, yielded in job order as results arrive. workers
+    defaults to the cpu count, 0 runs everything in this process.
+    """
+    tasks = [_task(job) for job in jobs]
+    table = equipment_table()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 0 or not tasks:
+        _init_worker(table)
+        for task in tasks:
+            yield _results(_run(task))
+        return
+
+    if chunksize is None:
+        # a few chunks per worker keeps them all busy to the end
+        chunksize = max(1, len(tasks) // (workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(table,),
+    ) as pool:
+        for result in pool.map(_run, tasks, chunksize=chunksize):
+            yield _results(result)
+
+
+def sweep(
+    profiles: Sequence[Weights],
+    *,
+    classes: Iterable[PlayerClass] = tuple(PlayerClass),
+    levels: Iterable[int] = range(1, 11),
+    k: int = 1,
+    minimums: Optional[Mapping[str, int]] = None,
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[SearchJob, List[GearResult]]]:
+    """every class x level x weight profile, as (job, results)"""
+    jobs = [
+        SearchJob(player_class, level, weights, k, minimums)
+        for player_class in classes
+        for level in levels
+        for weights in profiles
+    ]
+    return zip(jobs, search(jobs, workers=workers))
@@ -2,8 +2,12 @@
 from __future__ import annotations
 from typing import (
     Any,
-    Generator,
+    Iterable,
+    Iterator,
     Sequence,
+    Tuple,
+    Union,
+    overload,
 )
 
 # This file is depended on by gen.equipment, be careful not to create cyclic
@@ -11,6 +15,34 @@ from typing import (
 
 
 class Stats:
+    """
+    immutable group of stats. + and - return new Stats, use StatsAccumulator
+    to sum many Stats without allocating each intermediate result. Stats
+    iterate and index like an 8-tuple but only compare equal to other Stats,
+    and don't order or concatenate like one.
+    """
+
+    __slots__ = (
+        'hp',
+        'mp',
+        'strength',
+        'defense',
+        'agility',
+        'intelligence',
+        'wisdom',
+        'luck',
+    )
+
+    _fields: Tuple[str, ...] = __slots__
+
+    hp: int
+    mp: int
+    strength: int
+    defense: int
+    agility: int
+    intelligence: int
+    wisdom: int
+    luck: int
 
     def __init__(
         self,
@@ -23,47 +55,192 @@ class Stats:
         wisdom: int,
         luck: int,
     ) -> None:
-        self.hp           = hp
-        self.mp           = mp
-        self.strength     = strength
-        self.defense      = defense
-        self.agility      = agility
-        self.intelligence = intelligence
-        self.wisdom       = wisdom
-        self.luck         = luck
-
-    def __iter__(self) -> Generator[int, None, None]:
-        yield self.hp
-        yield self.mp
-        yield self.strength
-        yield self.defense
-        yield self.agility
-        yield self.intelligence
-        yield self.wisdom
-        yield self.luck
+        # __setattr__ refuses, so fill the slots through their descriptors
+        _set_hp(self, hp)
+        _set_mp(self, mp)
+        _set_strength(self, strength)
+        _set_defense(self, defense)
+        _set_agility(self, agility)
+        _set_intelligence(self, intelligence)
+        _set_wisdom(self, wisdom)
+        _set_luck(self, luck)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # instances are shared (ZERO_STATS, cache keys, base stat tables)
+        raise AttributeError(f'Stats is immutable, cannot set {name}')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'Stats is immutable, cannot delete {name}')
+
+    @classmethod
+    def _make(cls, stats: Iterable[int]) -> Stats:
+        return cls(*stats)
+
+    def _astuple(self) -> Tuple[int, ...]:
+        return (
+            self.hp,
+            self.mp,
+            self.strength,
+            self.defense,
+            self.agility,
+            self.intelligence,
+            self.wisdom,
+            self.luck,
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._astuple())
+
+    def __len__(self) -> int:
+        return 8
+
+    @overload
+    def __getitem__(self, i: int) -> int: ...
+    @overload
+    def __getitem__(self, i: slice) -> Tuple[int, ...]: ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        return self._astuple()[i]
+
+    def __eq__(self, o: Any) -> bool:
+        if isinstance(o, Stats):
+            return self._astuple() == o._astuple()
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+
+    def __repr__(self) -> str:
+        values = ', '.join(
+            f'{name}={value}' for name, value in zip(self._fields, self)
+        )
+        return f'Stats({values})'
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (Stats, self._astuple())
 
     def __add__(self, o: Any) -> Stats:
         if isinstance(o, Stats):
-            self.hp += o.hp
-            self.mp += o.mp
-            self.strength += o.strength
-            self.defense += o.defense
-            self.agility += o.agility
-            self.intelligence += o.intelligence
-            self.wisdom += o.wisdom
-            self.luck += o.luck
-            return self
-        raise NotImplemented
+            return Stats(
+                self.hp + o.hp,
+                self.mp + o.mp,
+                self.strength + o.strength,
+                self.defense + o.defense,
+                self.agility + o.agility,
+                self.intelligence + o.intelligence,
+                self.wisdom + o.wisdom,
+                self.luck + o.luck,
+            )
+        return NotImplemented
+
+    def __sub__(self, o: Any) -> Stats:
+        if isinstance(o, Stats):
+            return Stats(
+                self.hp - o.hp,
+                self.mp - o.mp,
+                self.strength - o.strength,
+                self.defense - o.defense,
+                self.agility - o.agility,
+                self.intelligence - o.intelligence,
+                self.wisdom - o.wisdom,
+                self.luck - o.luck,
+            )
+        return NotImplemented
 
     @classmethod
     def from_sequence(
         cls,
-        stats: Sequence[int], 
+        stats: Sequence[int],
     ) -> Stats:
         if len(stats) != 8:
             raise ValueError(f'invalid stats tuple: {stats}')
-        return Stats(*stats)
+        return cls(*stats)
 
+    @classmethod
+    def zero(cls) -> Stats:
+        return ZERO_STATS
 
     def clone(self) -> Stats:
-        return Stats.from_sequence(tuple(self))
+        # immutable, so a clone can share the original
+        return self
+
+
+(
+    _set_hp,
+    _set_mp,
+    _set_strength,
+    _set_defense,
+    _set_agility,
+    _set_intelligence,
+    _set_wisdom,
+    _set_luck,
+) = (getattr(Stats, name).__set__ for name in Stats._fields)
+
+ZERO_STATS = Stats(0, 0, 0, 0, 0, 0, 0, 0)
+
+
+class StatsAccumulator:
+    """mutable running total of Stats, for hot loops"""
+
+    __slots__ = (
+        'hp',
+        'mp',
+        'strength',
+        'defense',
+        'agility',
+        'intelligence',
+        'wisdom',
+        'luck',
+    )
+
+    def __init__(self, start: Stats = ZERO_STATS) -> None:
+        (
+            self.hp,
+            self.mp,
+            self.strength,
+            self.defense,
+            self.agility,
+            self.intelligence,
+            self.wisdom,
+            self.luck,
+        ) = start
+
+    def add(self, o: Stats) -> None:
+        self.hp += o.hp
+        self.mp += o.mp
+        self.strength += o.strength
+        self.defense += o.defense
+        self.agility += o.agility
+        self.intelligence += o.intelligence
+        self.wisdom += o.wisdom
+        self.luck += o.luck
+
+    def sub(self, o: Stats) -> None:
+        self.hp -= o.hp
+        self.mp -= o.mp
+        self.strength -= o.strength
+        self.defense -= o.defense
+        self.agility -= o.agility
+        self.intelligence -= o.intelligence
+        self.wisdom -= o.wisdom
+        self.luck -= o.luck
+
+    def __iadd__(self, o: Stats) -> StatsAccumulator:
+        self.add(o)
+        return self
+
+    def __isub__(self, o: Stats) -> StatsAccumulator:
+        self.sub(o)
+        return self
+
+    def stats(self) -> Stats:
+        return Stats(
+            self.hp,
+            self.mp,
+            self.strength,
+            self.defense,
+            self.agility,
+            self.intelligence,
+            self.wisdom,
+            self.luck,
+        )
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+import numpy
+
+from .gen.equipment import (
+    BodyEquipment,
+    HeadEquipment,
+    MainHandEquipment,
+    OffHandEquipment,
+)
+from .gen.equipment_slot import EquipmentSlot
+from .gen.player_class import PlayerClass
+from .gen.player_stats import STATS_BY_PLAYER_CLASS
+from .item import EquipmentItem
+from .stats import Stats
+
+# requires numpy (pip install pyretrommo[numpy])
+
+if TYPE_CHECKING:
+    from typing_extensions import Protocol
+
+    class IndexArray(Protocol):
+        """
+        an index or mask array. Structural, so it can't overlap int even
+        where numpy.ndarray is Any (no numpy stubs).
+        """
+
+        @property
+        def dtype(self) -> Any: ...
+
+        def __len__(self) -> int: ...
+
+
+STAT_NAMES: Tuple[str, ...] = Stats._fields
+DTYPE = numpy.int32
+
+Weights = Union[Stats, Sequence[float], Mapping[str, float]]
+Operand = Union['StatsMatrix', Stats, Sequence[int], numpy.ndarray]
+
+
+def weight_vector(weights: Weights) -> numpy.ndarray:
+    """stat weights as a float vector, a mapping may name only some stats"""
+    if isinstance(weights, Mapping):
+        unknown = set(weights) - set(STAT_NAMES)
+        if unknown:
+            raise ValueError(f'unknown stats: {sorted(unknown)}')
+        return numpy.array(
+            [weights.get(name, 0.0) for name in STAT_NAMES],
+            dtype=numpy.float64,
+        )
+    vector = numpy.asarray(weights, dtype=numpy.float64)
+    if vector.shape != (8,):
+        raise ValueError(f'invalid stat weights: {weights}')
+    return vector
+
+
+def _operand(o: Operand) -> numpy.ndarray:
+    if isinstance(o, StatsMatrix):
+        return o.data
+    return numpy.asarray(o, dtype=DTYPE)
+
+
+class StatsMatrix:
+    """N rows of Stats in a single (N, 8) int32 array"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: Any) -> None:
+        data = numpy.asarray(data, dtype=DTYPE)
+        if data.ndim == 1:
+            data = data.reshape(1, -1)
+        if data.ndim != 2 or data.shape[1] != 8:
+            raise ValueError(f'invalid stats matrix shape: {data.shape}')
+        self.data = data
+
+    @classmethod
+    def from_stats(cls, stats: Iterable[Stats]) -> StatsMatrix:
+        rows = list(stats)
+        if not rows:
+            return cls.zeros(0)
+        return cls(rows)
+
+    @classmethod
+    def zeros(cls, n: int) -> StatsMatrix:
+        return cls(numpy.zeros((n, 8), dtype=DTYPE))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @overload
+    def __getitem__(self, i: int) -> Stats: ...
+    @overload
+    def __getitem__(
+        self,
+        i: Union[slice, IndexArray, Sequence[int]],
+    ) -> StatsMatrix: ...
+
+    def __getitem__(self, i: Any) -> Union[Stats, StatsMatrix]:
+        if isinstance(i, (int, numpy.integer)):
+            return Stats._make(self.data[i].tolist())
+        return StatsMatrix(self.data[i])
+
+    def __iter__(self) -> Iterator[Stats]:
+        return iter(self.to_stats())
+
+    def __repr__(self) -> str:
+        return f'<StatsMatrix: {len(self)} rows>'
+
+    def to_stats(self) -> List[Stats]:
+        make = Stats._make
+        return [make(row) for row in self.data.tolist()]
+
+    def __add__(self, o: Operand) -> StatsMatrix:
+        return StatsMatrix(self.data + _operand(o))
+
+    def __radd__(self, o: Operand) -> StatsMatrix:
+        return StatsMatrix(_operand(o) + self.data)
+
+    def __sub__(self, o: Operand) -> StatsMatrix:
+        return StatsMatrix(self.data - _operand(o))
+
+    def sum(self) -> Stats:
+        return Stats._make(self.data.sum(axis=0).tolist())
+
+    def column(self, name: str) -> numpy.ndarray:
+        return self.data[:, STAT_NAMES.index(name)]
+
+    def score(self, weights: Weights) -> numpy.ndarray:
+        """weighted sum of each row's stats"""
+        return self.data @ weight_vector(weights)
+
+    def top_k(self, weights: Weights, k: int) -> numpy.ndarray:
+        """indices of the k best rows by score, best first"""
+        scores = self.score(weights)
+        k = min(k, len(scores))
+        if k <= 0:
+            return numpy.zeros(0, dtype=numpy.intp)
+        best = numpy.argpartition(-scores, k - 1)[:k]
+        return best[numpy.argsort(-scores[best], kind='stable')]
+
+    def ge(self, o: Operand) -> numpy.ndarray:
+        """rows where every stat is >= o"""
+        return (self.data >= _operand(o)).all(axis=1)
+
+    def dominates(self, o: Operand) -> numpy.ndarray:
+        """rows that are >= o in every stat and > in at least one"""
+        other = _operand(o)
+        return (
+            (self.data >= other).all(axis=1) &
+            (self.data > other).any(axis=1)
+        )
+
+
+class EquipmentTable(NamedTuple):
+    items: Tuple[EquipmentItem, ...]
+    stats: StatsMatrix
+
+
+def _equipment_table(items: Iterable[EquipmentItem]) -> EquipmentTable:
+    items = tuple(items)
+    return EquipmentTable(
+        items,
+        StatsMatrix.from_stats(item.stats for item in items),
+    )
+
+
+# rows are levels, like STATS_BY_PLAYER_CLASS
+STATS_MATRIX_BY_PLAYER_CLASS: Dict[PlayerClass, StatsMatrix] = {
+    player_class: StatsMatrix.from_stats(stats)
+    for player_class, stats in STATS_BY_PLAYER_CLASS.items()
+}
+
+EQUIPMENT_STATS_MATRIX: Dict[EquipmentSlot, EquipmentTable] = {
+    EquipmentSlot.Head: _equipment_table(HeadEquipment),
+    EquipmentSlot.Body: _equipment_table(BodyEquipment),
+    EquipmentSlot.MainHand: _equipment_table(MainHandEquipment),
+    EquipmentSlot.OffHand: _equipment_table(OffHandEquipment),
+}
@@ -15,6 +15,10 @@ setup(
         'requests==2.26.0',
         'beautifulsoup4==4.10.0',
     ],
+    extras_require={
+        'fast': ['orjson'],
+        'numpy': ['numpy'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3.7",
     ],